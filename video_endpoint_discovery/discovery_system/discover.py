@@ -1,8 +1,85 @@
-from discovery_system.network_utils import scan_network
+import sys
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from operator import itemgetter
+
+from discovery_system.network_utils import scan_network, iter_scan_network, CONNECT_TIMEOUT
 from discovery_system.endpoint_details import extract_endpoint_details
-from discovery_system.endpoint_classification import classify_endpoints
+from discovery_system.endpoint_classification import classify_endpoints, iter_classify_endpoints
+
+# Recent scan_network results, keyed by (ip_range, forced IPs, connect timeout,
+# credentials hash).
+# Re-scanning the same range within SCAN_CACHE_TTL seconds reuses the result.
+# Off (0) by default, so every scan sees the network as it is now; callers
+# that re-scan the same range often can opt in, e.g. SCAN_CACHE_TTL = 60.
+SCAN_CACHE_TTL = 0
+SCAN_CACHE_SIZE = 32
+_scan_cache = OrderedDict()
+_scan_cache_lock = threading.Lock()
+
+# Fields kept for each endpoint when details are not requested
+_ip_and_name = itemgetter('ip', 'name')
 
-def find_endpoints(ip_range=None, include_details=True, force_endpoints=None, username="admin", password="TANDBERG", num_workers=4):
+def clear_scan_cache():
+    """Forget all cached scan results, forcing the next find_endpoints() to re-scan"""
+    with _scan_cache_lock:
+        _scan_cache.clear()
+
+def _cached_scan_network(ip_range, force_endpoints, username, password, connect_timeout):
+    """
+    Run scan_network, reusing a recent result for the same range and credentials
+    when SCAN_CACHE_TTL is set
+    
+    Returns:
+        list: Copies of the scanned devices, safe for the caller to modify
+    """
+    if SCAN_CACHE_TTL <= 0:
+        return scan_network(
+            ip_range,
+            force_endpoints=force_endpoints,
+            username=username,
+            password=password,
+            connect_timeout=connect_timeout
+        )
+    
+    credentials_hash = hashlib.blake2b(
+        f"{username}\0{password}".encode(), digest_size=8
+    ).digest()
+    key = (ip_range, tuple(force_endpoints or ()), connect_timeout, credentials_hash)
+    
+    now = time.monotonic()
+    with _scan_cache_lock:
+        cached = _scan_cache.get(key)
+        if cached is not None and now - cached[0] < SCAN_CACHE_TTL:
+            _scan_cache.move_to_end(key)
+        else:
+            cached = None
+    if cached is not None:
+        # Not on stdout, which carries the --json output
+        print(f"Using cached scan results for {ip_range or 'local network'}", file=sys.stderr)
+        return copy.deepcopy(cached[1])
+    
+    devices = scan_network(
+        ip_range,
+        force_endpoints=force_endpoints,
+        username=username,
+        password=password,
+        connect_timeout=connect_timeout
+    )
+    
+    entry = (now, copy.deepcopy(devices))
+    with _scan_cache_lock:
+        _scan_cache[key] = entry
+        _scan_cache.move_to_end(key)
+        while len(_scan_cache) > SCAN_CACHE_SIZE:
+            _scan_cache.popitem(last=False)
+    
+    return devices
+
+def find_endpoints(ip_range=None, include_details=True, force_endpoints=None, username="admin", password="TANDBERG", num_workers=4, connect_timeout=CONNECT_TIMEOUT):
     """
     Find video conferencing endpoints on the network
     
@@ -14,6 +91,7 @@ def find_endpoints(ip_range=None, include_details=True, force_endpoints=None, us
         username (str): Username for authenticating with endpoints
         password (str): Password for authenticating with endpoints
         num_workers (int): Number of worker threads to use for classification
+        connect_timeout (float): TCP connect timeout in seconds for the network scan
     
     Returns:
         list: List of dictionaries containing video endpoint information
@@ -21,7 +99,7 @@ def find_endpoints(ip_range=None, include_details=True, force_endpoints=None, us
     print("Searching for video endpoints...")
     
     # Scan the network for all devices
-    all_devices = scan_network(ip_range, force_endpoints=force_endpoints, username=username, password=password)
+    all_devices = _cached_scan_network(ip_range, force_endpoints, username, password, connect_timeout)
     
     # Filter for video endpoints only
     video_endpoints = [device for device in all_devices if device.get('type') == 'video_endpoint']
@@ -38,21 +116,60 @@ def find_endpoints(ip_range=None, include_details=True, force_endpoints=None, us
                 username=username,
                 password=password
             )
-        # Otherwise, simplify the output
+        # Otherwise, simplify the output to just the IP and name
         else:
             video_endpoints = [
-                {
-                    'ip': device['ip'],
-                    'name': device['name'],
-                    'type': 'video_endpoint'
-                } 
-                for device in video_endpoints
+                {'ip': ip, 'name': name, 'type': 'video_endpoint'}
+                for ip, name in map(_ip_and_name, video_endpoints)
             ]
     else:
         print("No video endpoints found")
     
     return video_endpoints
 
+def iter_endpoints(ip_range=None, include_details=True, force_endpoints=None, username="admin", password="TANDBERG", num_workers=4, connect_timeout=CONNECT_TIMEOUT):
+    """
+    Find video conferencing endpoints on the network, yielding each one as soon
+    as it has been found (and classified, if details are requested)
+    
+    Unlike find_endpoints(), the scan always runs; its results are handed out
+    while it is still going, so they are not kept in the scan cache.
+    
+    Args:
+        ip_range (str): CIDR notation of IP range to scan (e.g. '192.168.1.0/24')
+                       If None, tries to determine the local network
+        include_details (bool): Whether to include all device details or just basic info
+        force_endpoints (list): List of IPs to force classify as video endpoints
+        username (str): Username for authenticating with endpoints
+        password (str): Password for authenticating with endpoints
+        num_workers (int): Number of worker threads to use for classification
+        connect_timeout (float): TCP connect timeout in seconds for the network scan
+    
+    Yields:
+        dict: Video endpoint information, in the order the endpoints were finished
+    """
+    print("Searching for video endpoints...")
+    
+    devices = iter_scan_network(
+        ip_range,
+        force_endpoints=force_endpoints,
+        username=username,
+        password=password,
+        connect_timeout=connect_timeout
+    )
+    video_endpoints = (device for device in devices if device.get('type') == 'video_endpoint')
+    
+    if include_details:
+        yield from iter_classify_endpoints(
+            video_endpoints,
+            num_workers=num_workers,
+            username=username,
+            password=password
+        )
+    else:
+        for ip, name in map(_ip_and_name, video_endpoints):
+            yield {'ip': ip, 'name': name, 'type': 'video_endpoint'}
+
 def get_endpoint_details(endpoint_ip, username="admin", password="TANDBERG"):
     """
     Get detailed information about a specific endpoint
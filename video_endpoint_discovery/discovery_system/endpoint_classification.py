@@ -1,23 +1,76 @@
 """
 Endpoint Classification Worker Module
 ------------------------------------
-Implements a worker-based system for classifying video endpoints using a queue.
-This improves performance by allowing parallel classification of endpoints.
+Classifies video endpoints in parallel on a shared thread pool, one task per
+endpoint. This improves performance by allowing parallel classification of endpoints.
 """
 
 import threading
+import itertools
 import queue
+import warnings
+import concurrent.futures
 from typing import List, Dict, Any
 from discovery_system.endpoint_details import extract_endpoint_details
 
 
+def _classify_endpoint(endpoint, username, password):
+    """
+    Classify a single endpoint, falling back to the scan data if that fails.
+    
+    Args:
+        endpoint (dict): Endpoint found by the network scan
+        username (str): Username for authenticating with the endpoint
+        password (str): Password for authenticating with the endpoint
+        
+    Returns:
+        dict: The classified endpoint, or the original endpoint if classification failed
+    """
+    try:
+        # Extract detailed information about the endpoint
+        detailed_endpoint = extract_endpoint_details(
+            endpoint, 
+            username=username, 
+            password=password
+        )
+        
+        # Preserve original endpoint properties that might be overwritten
+        # This is crucial for keeping original names and other data from the scan
+        for key in ['name', 'hostname', 'ip', 'open_ports', 'type']:
+            if key in endpoint and key not in detailed_endpoint:
+                detailed_endpoint[key] = endpoint[key]
+        
+        # Add status and capabilities information if not already present
+        if 'status' not in detailed_endpoint:
+            detailed_endpoint['status'] = 'online'
+            
+        if 'capabilities' not in detailed_endpoint:
+            detailed_endpoint['capabilities'] = ['video', 'audio']
+            
+        print(f"Classified endpoint at {endpoint['ip']}: "
+              f"{detailed_endpoint.get('manufacturer', 'Unknown')} "
+              f"{detailed_endpoint.get('model', 'Unknown')}")
+        
+        return detailed_endpoint
+        
+    except Exception as e:
+        print(f"Error classifying endpoint at {endpoint['ip']}: {str(e)}")
+        
+        # Add the endpoint to results even if classification failed
+        return endpoint
+
+
 class EndpointClassificationWorker:
     """
     Worker class that processes video endpoints from a queue and classifies them.
     
-    This allows for parallel classification of endpoints, improving performance.
+    Deprecated: classify_endpoints() no longer uses workers; it submits each
+    endpoint to a shared thread pool instead. Kept for existing callers.
     """
     
+    # Attributes read on every pass through run(); slots make them plain offset loads
+    __slots__ = ('endpoint_queue', 'results', 'lock', 'username', 'password')
+    
     def __init__(self, endpoint_queue, results, lock, username="admin", password="TANDBERG"):
         """
         Initialize the worker.
@@ -29,6 +82,11 @@ class EndpointClassificationWorker:
             username (str): Username for authenticating with endpoints
             password (str): Password for authenticating with endpoints
         """
+        warnings.warn(
+            "EndpointClassificationWorker is deprecated; use classify_endpoints()",
+            DeprecationWarning,
+            stacklevel=2
+        )
         self.endpoint_queue = endpoint_queue
         self.results = results
         self.lock = lock
@@ -45,93 +103,159 @@ class EndpointClassificationWorker:
             if endpoint is None:
                 break
             
-            # Process the endpoint
-            try:
-                # Extract detailed information about the endpoint
-                detailed_endpoint = extract_endpoint_details(
-                    endpoint, 
-                    username=self.username, 
-                    password=self.password
-                )
-                
-                # Preserve original endpoint properties that might be overwritten
-                # This is crucial for keeping original names and other data from the scan
-                for key in ['name', 'hostname', 'ip', 'open_ports', 'type']:
-                    if key in endpoint and key not in detailed_endpoint:
-                        detailed_endpoint[key] = endpoint[key]
-                
-                # Add status and capabilities information if not already present
-                if 'status' not in detailed_endpoint:
-                    detailed_endpoint['status'] = 'online'
-                    
-                if 'capabilities' not in detailed_endpoint:
-                    detailed_endpoint['capabilities'] = ['video', 'audio']
-                
-                # Add the classified endpoint to the results
-                with self.lock:
-                    self.results.append(detailed_endpoint)
-                    
-                print(f"Classified endpoint at {endpoint['ip']}: "
-                      f"{detailed_endpoint.get('manufacturer', 'Unknown')} "
-                      f"{detailed_endpoint.get('model', 'Unknown')}")
-                
-            except Exception as e:
-                print(f"Error classifying endpoint at {endpoint['ip']}: {str(e)}")
-                
-                # Add the endpoint to results even if classification failed
-                with self.lock:
-                    self.results.append(endpoint)
+            # Classify the endpoint; failed endpoints are kept as they are
+            detailed_endpoint = _classify_endpoint(endpoint, self.username, self.password)
+            with self.lock:
+                self.results.append(detailed_endpoint)
             
             # Mark the task as done
             self.endpoint_queue.task_done()
 
 
+# Worker threads are kept alive between classify_endpoints() calls, so repeated
+# classification of small batches doesn't pay for thread start-up every time.
+# The pool has a fixed size and only starts threads as they are needed; each
+# call limits its own number of endpoints in flight to num_workers.
+CLASSIFICATION_POOL_SIZE = 32
+_EXECUTOR = None
+_EXECUTOR_LOCK = threading.Lock()
+
+def _get_executor():
+    """
+    Return the shared classification executor, creating it on first use
+    
+    Returns:
+        ThreadPoolExecutor: Executor with CLASSIFICATION_POOL_SIZE threads at most
+    """
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+                max_workers=CLASSIFICATION_POOL_SIZE,
+                thread_name_prefix='epclass'
+            )
+        return _EXECUTOR
+
+def _submit_bounded(executor, slots, endpoint, username, password):
+    """
+    Submit one endpoint for classification once one of the caller's slots is free
+    
+    Args:
+        executor (ThreadPoolExecutor): The shared classification executor
+        slots (BoundedSemaphore): The caller's num_workers slots, released when
+                                  the endpoint's classification has finished
+        endpoint (dict): Endpoint to classify
+        username (str): Username for authenticating with the endpoint
+        password (str): Password for authenticating with the endpoint
+        
+    Returns:
+        Future: Future of the classified endpoint
+    """
+    slots.acquire()
+    try:
+        future = executor.submit(_classify_endpoint, endpoint, username, password)
+    except BaseException:
+        slots.release()
+        raise
+    future.add_done_callback(lambda _: slots.release())
+    return future
+
+
 def classify_endpoints(endpoints, num_workers=4, username="admin", password="TANDBERG"):
     """
     Classify a list of endpoints using multiple worker threads.
     
     Args:
         endpoints (list): List of endpoints to classify
-        num_workers (int): Number of worker threads to use
+        num_workers (int): Maximum number of endpoints classified at once
         username (str): Username for authenticating with endpoints
         password (str): Password for authenticating with endpoints
         
     Returns:
         list: List of classified endpoints
     """
-    # Create a queue for endpoints
-    endpoint_queue = queue.Queue()
-    
-    # Create a list for results with a lock for thread-safe access
-    results = []
-    lock = threading.Lock()
-    
-    # Create and start worker threads
-    workers = []
-    for _ in range(num_workers):
-        worker = EndpointClassificationWorker(
-            endpoint_queue=endpoint_queue,
-            results=results,
-            lock=lock,
-            username=username,
-            password=password
-        )
+    # Never use more threads than there are endpoints to classify
+    num_workers = min(num_workers, len(endpoints))
+    
+    if num_workers < 1:
+        return []
+    
+    # One task per endpoint on the shared executor, with at most num_workers
+    # of them in flight; results are collected in the order the endpoints were
+    # given, and an unexpected error in a task is raised here instead of
+    # silently losing the endpoint
+    executor = _get_executor()
+    slots = threading.BoundedSemaphore(num_workers)
+    futures = [
+        _submit_bounded(executor, slots, endpoint, username, password)
+        for endpoint in endpoints
+    ]
+    return [future.result() for future in futures]
+
+
+def iter_classify_endpoints(endpoints, num_workers=4, username="admin", password="TANDBERG"):
+    """
+    Classify endpoints while they are still being found, yielding each one as
+    soon as its classification has finished.
+    
+    The endpoints iterable (e.g. a running network scan) is consumed on a
+    separate thread, so a slow scan doesn't hold back endpoints that have
+    already been classified.
+    
+    Args:
+        endpoints (iterable): Endpoints to classify
+        num_workers (int): Maximum number of endpoints classified at once
+        username (str): Username for authenticating with endpoints
+        password (str): Password for authenticating with endpoints
         
-        thread = threading.Thread(target=worker.run)
-        thread.daemon = True
-        thread.start()
-        workers.append(thread)
+    Yields:
+        dict: Classified endpoints, in the order their classification finished
+    """
+    if num_workers < 1:
+        return
+    
+    # Wait for the first endpoint before using any threads, so an empty scan
+    # never touches the pool
+    endpoints = iter(endpoints)
+    first = next(endpoints, None)
+    if first is None:
+        return
+    endpoints = itertools.chain([first], endpoints)
+    
+    executor = _get_executor()
+    slots = threading.BoundedSemaphore(num_workers)
+    finished = queue.SimpleQueue()
     
-    # Add endpoints to the queue
-    for endpoint in endpoints:
-        endpoint_queue.put(endpoint)
+    def submit_all():
+        # Put every classified endpoint's future on the queue as it finishes,
+        # followed by the number of endpoints submitted once the input ends.
+        # Submitting blocks here, not in the consumer, while num_workers
+        # endpoints are in flight.
+        submitted = 0
+        try:
+            for endpoint in endpoints:
+                future = _submit_bounded(executor, slots, endpoint, username, password)
+                future.add_done_callback(finished.put)
+                submitted += 1
+        except Exception as e:
+            finished.put(e)
+        finished.put(submitted)
     
-    # Add sentinel values to signal workers to exit
-    for _ in range(num_workers):
-        endpoint_queue.put(None)
+    threading.Thread(target=submit_all, name='epclass-feed', daemon=True).start()
     
-    # Wait for all worker threads to finish
-    for worker in workers:
-        worker.join()
+    total = None
+    yielded = 0
+    error = None
+    while total is None or yielded < total:
+        item = finished.get()
+        if isinstance(item, Exception):
+            error = item
+        elif isinstance(item, int):
+            total = item
+        else:
+            yielded += 1
+            yield item.result()
     
-    return results
+    # Endpoints found before the input failed have been handed out already
+    if error is not None:
+        raise error
@@ -9,14 +9,336 @@ approaches to retrieving device information.
 """
 
 import re
+import sys
+import copy
+import hashlib
+import time
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from io import BytesIO
 import requests
+from requests.adapters import HTTPAdapter
 import urllib3
 from bs4 import BeautifulSoup
 
+from discovery_system.vendors import get_io_executor
+from discovery_system.network_utils import probe_ports
+
+# Prefer lxml (libxml2) for XML when it is installed, falling back to the
+# standard library parser otherwise
+try:
+    from lxml import etree as ET
+    HAVE_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    HAVE_LXML = False
+
+# Endpoint XML is untrusted, so never resolve entities, fetch external
+# resources or lift libxml2's size limits while parsing it (the stdlib parser
+# does none of these by default)
+_ITERPARSE_OPTIONS = {'resolve_entities': False, 'no_network': True, 'huge_tree': False} if HAVE_LXML else {}
+
+# Regular expressions used on every endpoint page, compiled once at import time
+_TITLE_RE = re.compile(r'<title>(.*?)</title>', re.IGNORECASE)
+_CISCO_TITLE_RE = re.compile(r'<title>(?:Cisco)?\s*(?:Webex)?\s*(.*?)</title>', re.IGNORECASE)
+
+# Value patterns for the different Cisco page layouts, in order of preference
+_CISCO_SW_VERSION_PATTERNS = (
+    # Standard span class
+    re.compile(r'<span class="sw-version">(.*?)</span>'),
+    # div with class sw-info (used in test data)
+    re.compile(r'<div class="sw-info">(.*?)</div>'),
+    # Table layout with Software Version label
+    re.compile(r'Software Version:?\s*</td>\s*<td[^>]*>(.*?)</td>', re.IGNORECASE),
+    # Modern label/value with "Software:" label
+    re.compile(r'<td[^>]*class="[^"]*label[^"]*"[^>]*>\s*Software:?\s*</td>\s*<td[^>]*class="[^"]*value[^"]*"[^>]*>\s*(.*?)\s*</td>', re.IGNORECASE),
+    # Info blocks with label/value spans
+    re.compile(r'<span[^>]*class="[^"]*info-label[^"]*"[^>]*>\s*Software:?\s*</span>\s*<span[^>]*class="[^"]*info-value[^"]*"[^>]*>\s*(.*?)\s*</span>', re.IGNORECASE),
+    # Paragraph format (older models)
+    re.compile(r'<p>\s*Software version:?\s*(.*?)\s*</p>', re.IGNORECASE),
+)
+
+_CISCO_SERIAL_PATTERNS = (
+    # Standard div class
+    re.compile(r'<div class="serial-number">(.*?)</div>'),
+    # span with 'Serial:' prefix (used in test data)
+    re.compile(r'<span>\s*Serial:\s*(.*?)\s*</span>'),
+    # Table layout with Serial Number label
+    re.compile(r'Serial Number:?\s*</td>\s*<td[^>]*>(.*?)</td>', re.IGNORECASE),
+    # Modern label/value with "Serial:" or "Serial Number:" label
+    re.compile(r'<td[^>]*class="[^"]*label[^"]*"[^>]*>\s*Serial(?: Number)?:?\s*</td>\s*<td[^>]*class="[^"]*value[^"]*"[^>]*>\s*(.*?)\s*</td>', re.IGNORECASE),
+    # Info blocks with label/value spans
+    re.compile(r'<span[^>]*class="[^"]*info-label[^"]*"[^>]*>\s*Serial(?: Number)?:?\s*</span>\s*<span[^>]*class="[^"]*info-value[^"]*"[^>]*>\s*(.*?)\s*</span>', re.IGNORECASE),
+    # Paragraph format (older models)
+    re.compile(r'<p>\s*Serial number:?\s*(.*?)\s*</p>', re.IGNORECASE),
+)
+
+_CISCO_MAC_PATTERNS = (
+    # Standard div class
+    re.compile(r'<div class="mac-address">(.*?)</div>'),
+    # span with 'MAC:' prefix (used in test data)
+    re.compile(r'<span>\s*MAC:\s*(.*?)\s*</span>'),
+    # Table layout with MAC Address label
+    re.compile(r'MAC Address:?\s*</td>\s*<td[^>]*>(.*?)</td>', re.IGNORECASE),
+    # Modern label/value with "MAC Address:" label
+    re.compile(r'<td[^>]*class="[^"]*label[^"]*"[^>]*>\s*MAC Address:?\s*</td>\s*<td[^>]*class="[^"]*value[^"]*"[^>]*>\s*(.*?)\s*</td>', re.IGNORECASE),
+    # Info blocks with label/value spans
+    re.compile(r'<span[^>]*class="[^"]*info-label[^"]*"[^>]*>\s*MAC Address:?\s*</span>\s*<span[^>]*class="[^"]*info-value[^"]*"[^>]*>\s*(.*?)\s*</span>', re.IGNORECASE),
+)
+
+_CISCO_FIELD_PATTERNS = (
+    ('sw_version', _CISCO_SW_VERSION_PATTERNS),
+    ('serial', _CISCO_SERIAL_PATTERNS),
+    ('mac_address', _CISCO_MAC_PATTERNS),
+)
+
+# Keywords identifying the manufacturer of an endpoint web page, as (lowercase
+# keyword, manufacturer). When a page contains several, the last one wins.
+_MANUFACTURER_KEYWORDS = (
+    ('cisco', 'Cisco'),
+    ('webex', 'Cisco'),
+    ('tandberg', 'TANDBERG'),
+    ('polycom', 'Polycom'),
+)
+
+# XML API fields that identify a Cisco endpoint well enough to skip its web page
+_XML_IDENTIFYING_FIELDS = ('model', 'sw_version')
+
+# Polycom and TANDBERG page patterns. Both fall back to the same table layout
+# for the software version.
+_POLYCOM_TITLE_RE = re.compile(r'<title>(?:Polycom)?\s*(.*?)</title>', re.IGNORECASE)
+_POLYCOM_SW_VERSION_RE = re.compile(r'<div class="software-version">(.*?)</div>')
+_POLYCOM_SYSTEM_NAME_RE = re.compile(r'<div class="system-name">(.*?)</div>')
+_TANDBERG_TITLE_RE = re.compile(r'<title>(?:TANDBERG)?\s*(.*?)</title>', re.IGNORECASE)
+_TANDBERG_SW_VERSION_RE = re.compile(r'<div id="sw-version">(.*?)</div>')
+_TANDBERG_PRODUCT_ID_RE = re.compile(r'<div id="product-id">(.*?)</div>')
+_SOFTWARE_TABLE_RE = re.compile(r'Software:\s*</td><td[^>]*>(.*?)</td>')
+
+# Label text that marks a version value on pages from unknown manufacturers
+_GENERIC_VERSION_LABEL_RE = re.compile(r'(version|software|firmware|sw version)', re.IGNORECASE)
+
+# Fields read from the Cisco XML API, as (details key, element paths relative
+# to the document root). When several paths are given, the first element
+# present in the document is used, as with chained find() calls.
+_STATUS_PRODUCT_ID = ('SystemUnit', 'ProductId')
+_STATUS_SW_NAME = ('SystemUnit', 'Software', 'DisplayName')
+_STATUS_SW_VERSION = ('SystemUnit', 'Software', 'Version')
+_STATUS_CAMERA = ('Cameras', 'Camera')
+
+_STATUS_XML_FIELDS = (
+    ('serial', (('SystemUnit', 'Hardware', 'SerialNumber'),)),
+    ('mac_address', (('SystemUnit', 'Hardware', 'MACAddress'), ('Network', 'Ethernet', 'MacAddress'))),
+    ('product_type', (('SystemUnit', 'ProductType'),)),
+    ('ip_address', (('Network', 'IPv4', 'Address'),)),
+    ('subnet_mask', (('Network', 'IPv4', 'SubnetMask'),)),
+    ('gateway', (('Network', 'IPv4', 'Gateway'),)),
+    ('sip_status', (('SIP', 'Registration', 'Status'),)),
+    ('sip_uri', (('SIP', 'Registration', 'URI'),)),
+    ('system_time', (('Time', 'SystemTime'),)),
+)
+
+# Test files use <n> instead of <Name>, so accept both
+_CONFIG_XML_FIELDS = (
+    ('system_name', (('SystemUnit', 'Name'), ('SystemUnit', 'n'))),
+    ('sip_uri', (('SIP', 'URI'),)),
+)
+_CONFIG_CONTACT_NAME = (('SystemUnit', 'ContactInfo', 'Name'), ('SystemUnit', 'ContactInfo', 'n'))
+_CONFIG_CONTACT_NUMBER = ('SystemUnit', 'ContactInfo', 'ContactNumber')
+
+_STATUS_XML_PATHS = frozenset(
+    [_STATUS_PRODUCT_ID, _STATUS_SW_NAME, _STATUS_SW_VERSION]
+    + [path for _, paths in _STATUS_XML_FIELDS for path in paths]
+)
+_CONFIG_XML_PATHS = frozenset(
+    [_CONFIG_CONTACT_NUMBER, *_CONFIG_CONTACT_NAME]
+    + [path for _, paths in _CONFIG_XML_FIELDS for path in paths]
+)
+
+# Labels searched for in the BeautifulSoup fallback
+_SOFTWARE_LABEL_RE = re.compile(r'(?:Software|Version)', re.IGNORECASE)
+_SERIAL_LABEL_RE = re.compile(r'Serial', re.IGNORECASE)
+
 # Disable SSL warnings for self-signed certificates
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-def access_cisco_xml_api(endpoint, username="admin", password="TANDBERG"):
+# Shared session so the several requests made to each endpoint (web page,
+# status.xml, config.xml) reuse pooled keep-alive connections instead of
+# paying a new TCP/TLS handshake every time
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=0)
+_SESSION.mount('https://', _ADAPTER)
+_SESSION.mount('http://', _ADAPTER)
+
+# Only the first part of an endpoint web page is downloaded and parsed
+_HTML_PARSE_CAP = 8192
+
+# Number of distinct Cisco pages whose parsed details are remembered. Endpoints
+# that are polled again usually serve byte-identical pages.
+CISCO_DETAILS_CACHE_SIZE = 256
+
+# Recent extract_endpoint_details results, keyed by the endpoint's address,
+# scan data and a hash of the credentials. An endpoint classified again within
+# DETAILS_CACHE_TTL seconds is answered without contacting it. Off (0) by
+# default, so every classification reflects the endpoint as it is now;
+# callers that classify the same endpoints often can opt in, e.g. 300.
+DETAILS_CACHE_TTL = 0
+DETAILS_CACHE_SIZE = 4096
+_details_cache = OrderedDict()
+# Classification workers share the cache; OrderedDict reordering and eviction
+# are not safe to interleave between threads
+_details_cache_lock = threading.Lock()
+
+# Endpoints handed over without any known open web port are checked with a
+# plain TCP connect to both web ports first, so an unreachable address costs
+# this timeout instead of the full page and XML API request timeouts
+PREFLIGHT_TIMEOUT = 0.5
+_WEB_PORTS = [443, 80]
+
+def clear_details_cache():
+    """Forget all cached endpoint details, forcing endpoints to be queried again"""
+    with _details_cache_lock:
+        _details_cache.clear()
+
+def _details_cache_key(endpoint, username, password):
+    """Build the _details_cache key for an endpoint and set of credentials"""
+    credentials_hash = hashlib.blake2b(
+        f"{username}\0{password}".encode(), digest_size=8
+    ).digest()
+    return (
+        endpoint['ip'],
+        endpoint.get('hostname'),
+        endpoint['type'],
+        tuple(sorted(endpoint.get('open_ports', []))),
+        credentials_hash
+    )
+
+def _reachable_web_ports(ip, timeout=PREFLIGHT_TIMEOUT):
+    """Return which of the web ports (443, 80) on ip accept a TCP connection, trying both at once"""
+    return frozenset(probe_ports([ip], ports=_WEB_PORTS, timeout=timeout).get(ip, ()))
+
+def _http_get(url, **kwargs):
+    """Send a GET request through the shared connection pool"""
+    return _SESSION.get(url, **kwargs)
+
+def close_session():
+    """
+    Close the pooled keep-alive connections to endpoints.
+    
+    Called by the command-line entry points once their scan is over; the
+    session is shared by every caller, so it is not closed after each batch.
+    It stays usable, and the next request simply opens a new connection.
+    """
+    _SESSION.close()
+
+def _read_html_head(response):
+    """
+    Read at most _HTML_PARSE_CAP characters of an endpoint's web page.
+    
+    The title and system information blocks sit at the top of the page, so
+    there is no need to download (or parse) the rest of a large status page.
+    
+    Args:
+        response: Response from _http_get(), requested with stream=True
+        
+    Returns:
+        str: Start of the page content
+    """
+    try:
+        head = response.raw.read(_HTML_PARSE_CAP, decode_content=True)
+    finally:
+        response.close()
+    return head.decode(response.encoding or 'utf-8', errors='replace')
+
+def _parse_xml_fields(xml_source, wanted_paths, element_handlers=None):
+    """
+    Read element text from an XML document in a single incremental pass.
+    
+    Only the requested elements are kept; every finished top-level section is
+    cleared as soon as it has been read, and parsing stops once every section
+    containing a requested path has been closed. When reading from a stream,
+    the rest of the document is never read.
+    
+    Args:
+        xml_source (str or file): XML document, or a binary stream to read it from
+        wanted_paths (frozenset): Element paths relative to the root, as tuples of tags
+        element_handlers (dict): Optional {path: callback} called with every complete
+                                 element at that path, for repeated elements
+        
+    Returns:
+        dict: {path: text} for the first element found at each wanted path
+              (text is None for empty elements)
+    """
+    element_handlers = element_handlers or {}
+    pending_sections = {path[0] for path in wanted_paths} | {path[0] for path in element_handlers}
+    found = {}
+    path = []
+    
+    if isinstance(xml_source, str):
+        xml_source = BytesIO(xml_source.encode('utf-8'))
+    
+    for event, elem in ET.iterparse(xml_source, events=('start', 'end'), **_ITERPARSE_OPTIONS):
+        if event == 'start':
+            path.append(elem.tag)
+            continue
+        
+        key = tuple(path[1:])
+        if key in wanted_paths and key not in found:
+            found[key] = elem.text
+        handler = element_handlers.get(key)
+        if handler is not None:
+            handler(elem)
+        
+        path.pop()
+        if len(path) == 1:
+            elem.clear()
+            pending_sections.discard(key[0])
+            if not pending_sections:
+                break
+    
+    return found
+
+def _xml_body(response):
+    """
+    Return the body of an XML API response for _parse_xml_fields.
+    
+    Streamed responses are parsed straight from the socket, so parsing can stop
+    before a large document has been downloaded. The XML declaration, not the
+    HTTP headers, then decides the character encoding.
+    """
+    response.raw.decode_content = True
+    return response.raw
+
+def _close_response(response):
+    """Release the connection held by a streamed response"""
+    response.close()
+
+def _first_present(fields, paths):
+    """Return the text of the first of paths found in fields, or None"""
+    for path in paths:
+        if path in fields:
+            return fields[path]
+    return None
+
+def _parse_camera(camera):
+    """Extract camera details from a <Camera> element of status.xml"""
+    camera_info = {}
+    
+    model = camera.findtext('Model')
+    if model:
+        camera_info['model'] = model
+        
+    serial_number = camera.findtext('SerialNumber')
+    if serial_number:
+        camera_info['serial_number'] = serial_number
+        
+    connected = camera.findtext('Connected')
+    if connected:
+        camera_info['connected'] = connected.lower() == 'true'
+    
+    return camera_info
+
+def access_cisco_xml_api(endpoint, username="admin", password="TANDBERG", http_get=None):
     """
     Access Cisco endpoint's XML API (config.xml and status.xml files) to get detailed information.
     
@@ -24,17 +346,12 @@ def access_cisco_xml_api(endpoint, username="admin", password="TANDBERG"):
         endpoint (dict): Dictionary containing endpoint information (ip, hostname, open_ports)
         username (str): Username for authentication
         password (str): Password for authentication
+        http_get (callable): Optional replacement for requests.get() to fetch
+                             the files with, e.g. one that caches responses
         
     Returns:
         dict: Dictionary with detailed endpoint information or None if XML API is not available
     """
-    import xml.etree.ElementTree as ET
-    import requests
-    import urllib3
-    
-    # Disable SSL warnings for self-signed certificates
-    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-    
     details = {
         'manufacturer': 'Cisco'
     }
@@ -42,105 +359,65 @@ def access_cisco_xml_api(endpoint, username="admin", password="TANDBERG"):
     # Generate base URL for the endpoint
     base_url = f"https://{endpoint['ip']}" if 443 in endpoint.get('open_ports', []) else f"http://{endpoint['ip']}"
     
-    # Try to access status.xml first (contains hardware and software details)
+    # status.xml contains hardware and software details, config.xml the system
+    # name, SIP URI, etc. The two are independent, so request them concurrently
+    # on the shared I/O pool.
     status_url = f"{base_url}/status.xml"
+    config_url = f"{base_url}/config.xml"
     print(f"DEBUG: Trying to access Cisco XML API at {status_url}")
+    print(f"DEBUG: Trying to access Cisco XML API at {config_url}")
     
-    try:
-        status_response = requests.get(
-            status_url,
+    http_get = http_get or _http_get
+    
+    def fetch(url):
+        return http_get(
+            url,
             auth=(username, password),
             timeout=5,
-            verify=False
+            verify=False,
+            stream=True
         )
+    
+    io_executor = get_io_executor()
+    status_future = io_executor.submit(fetch, status_url)
+    config_future = io_executor.submit(fetch, config_url)
+    
+    try:
+        status_response = status_future.result()
         
         if status_response.status_code == 200:
             print(f"DEBUG: Successfully accessed status.xml")
             
-            # Parse the XML response
-            status_root = ET.fromstring(status_response.text)
+            # Parse the XML response, collecting camera information on the way
+            cameras = []
+            
+            def collect_camera(camera):
+                camera_info = _parse_camera(camera)
+                if camera_info:  # Only add if we found any camera info
+                    cameras.append(camera_info)
+            
+            fields = _parse_xml_fields(_xml_body(status_response), _STATUS_XML_PATHS, {_STATUS_CAMERA: collect_camera})
             
             # Extract product information
-            product_id = status_root.find('./SystemUnit/ProductId')
-            if product_id is not None and product_id.text:
+            product_id = fields.get(_STATUS_PRODUCT_ID)
+            if product_id:
                 # Extract just the model name as expected by tests
-                if "Cisco" in product_id.text:
-                    details['model'] = product_id.text.replace("Cisco ", "")
+                if "Cisco" in product_id:
+                    details['model'] = product_id.replace("Cisco ", "")
                 else:
-                    details['model'] = product_id.text
+                    details['model'] = product_id
             
             # Extract software version
-            sw_name = status_root.find('./SystemUnit/Software/DisplayName')
-            sw_version = status_root.find('./SystemUnit/Software/Version')
-            if sw_name is not None and sw_version is not None:
-                details['sw_version'] = f"{sw_name.text} {sw_version.text}"
-            elif sw_version is not None:
-                details['sw_version'] = sw_version.text
+            if _STATUS_SW_NAME in fields and _STATUS_SW_VERSION in fields:
+                details['sw_version'] = f"{fields[_STATUS_SW_NAME]} {fields[_STATUS_SW_VERSION]}"
+            elif _STATUS_SW_VERSION in fields:
+                details['sw_version'] = fields[_STATUS_SW_VERSION]
             
-            # Extract serial number
-            serial = status_root.find('./SystemUnit/Hardware/SerialNumber')
-            if serial is not None and serial.text:
-                details['serial'] = serial.text
-            
-            # Extract MAC address
-            mac = status_root.find('./SystemUnit/Hardware/MACAddress')
-            if mac is None:
-                mac = status_root.find('./Network/Ethernet/MacAddress')
-            if mac is not None and mac.text:
-                details['mac_address'] = mac.text
-            
-            # Extract product type
-            product_type = status_root.find('./SystemUnit/ProductType')
-            if product_type is not None and product_type.text:
-                details['product_type'] = product_type.text
-                
-            # Enhanced data extraction - Network information
-            ip_address = status_root.find('./Network/IPv4/Address')
-            if ip_address is not None and ip_address.text:
-                details['ip_address'] = ip_address.text
-                
-            subnet_mask = status_root.find('./Network/IPv4/SubnetMask')
-            if subnet_mask is not None and subnet_mask.text:
-                details['subnet_mask'] = subnet_mask.text
-                
-            gateway = status_root.find('./Network/IPv4/Gateway')
-            if gateway is not None and gateway.text:
-                details['gateway'] = gateway.text
-                
-            # SIP Status
-            sip_status = status_root.find('./SIP/Registration/Status')
-            if sip_status is not None and sip_status.text:
-                details['sip_status'] = sip_status.text
-                
-            sip_uri = status_root.find('./SIP/Registration/URI')
-            if sip_uri is not None and sip_uri.text:
-                details['sip_uri'] = sip_uri.text
-                
-            # System Time
-            system_time = status_root.find('./Time/SystemTime')
-            if system_time is not None and system_time.text:
-                details['system_time'] = system_time.text
-                
-            # Camera information
-            cameras = []
-            camera_elements = status_root.findall('./Cameras/Camera')
-            for camera in camera_elements:
-                camera_info = {}
-                
-                model = camera.find('./Model')
-                if model is not None and model.text:
-                    camera_info['model'] = model.text
-                    
-                serial_number = camera.find('./SerialNumber')
-                if serial_number is not None and serial_number.text:
-                    camera_info['serial_number'] = serial_number.text
-                    
-                connected = camera.find('./Connected')
-                if connected is not None and connected.text:
-                    camera_info['connected'] = connected.text.lower() == 'true'
-                    
-                if camera_info:  # Only add if we found any camera info
-                    cameras.append(camera_info)
+            # Extract hardware, network, SIP and time information
+            for key, paths in _STATUS_XML_FIELDS:
+                value = _first_present(fields, paths)
+                if value:
+                    details[key] = value
                     
             if cameras:  # Only add if we found any cameras
                 details['cameras'] = cameras
@@ -148,130 +425,87 @@ def access_cisco_xml_api(endpoint, username="admin", password="TANDBERG"):
     except Exception as e:
         print(f"DEBUG: Error accessing status.xml: {str(e)}")
     
-    # Try to access config.xml (contains system name, SIP URI, etc.)
-    config_url = f"{base_url}/config.xml"
-    print(f"DEBUG: Trying to access Cisco XML API at {config_url}")
-    
     try:
-        config_response = requests.get(
-            config_url,
-            auth=(username, password),
-            timeout=5,
-            verify=False
-        )
+        config_response = config_future.result()
         
         if config_response.status_code == 200:
             print(f"DEBUG: Successfully accessed config.xml")
             
             # Parse the XML response
-            config_root = ET.fromstring(config_response.text)
+            fields = _parse_xml_fields(_xml_body(config_response), _CONFIG_XML_PATHS)
             
-            # Extract system name - try both <Name> and <n> tags (test files use <n>)
-            system_name = config_root.find('./SystemUnit/Name')
-            if system_name is None:
-                system_name = config_root.find('./SystemUnit/n')
-            if system_name is not None and system_name.text:
-                details['system_name'] = system_name.text
+            # Extract system name and SIP URI
+            for key, paths in _CONFIG_XML_FIELDS:
+                value = _first_present(fields, paths)
+                if value:
+                    details[key] = value
             
-            # Extract SIP URI
-            sip_uri = config_root.find('./SIP/URI')
-            if sip_uri is not None and sip_uri.text:
-                details['sip_uri'] = sip_uri.text
-            
-            # Extract contact information - try both <Name> and <n> tags
-            contact_name = config_root.find('./SystemUnit/ContactInfo/Name')
-            if contact_name is None:
-                contact_name = config_root.find('./SystemUnit/ContactInfo/n')
-            contact_number = config_root.find('./SystemUnit/ContactInfo/ContactNumber')
-            if contact_name is not None and contact_name.text:
-                contact_info = contact_name.text
-                if contact_number is not None and contact_number.text:
-                    contact_info += f" ({contact_number.text})"
+            # Extract contact information
+            contact_name = _first_present(fields, _CONFIG_CONTACT_NAME)
+            contact_number = fields.get(_CONFIG_CONTACT_NUMBER)
+            if contact_name:
+                contact_info = contact_name
+                if contact_number:
+                    contact_info += f" ({contact_number})"
                 details['contact_info'] = contact_info
             
     except Exception as e:
         print(f"DEBUG: Error accessing config.xml: {str(e)}")
     
+    # Release both connections, including any unread rest of a document
+    for future in (status_future, config_future):
+        if future.exception() is None:
+            _close_response(future.result())
+    
     # Return None if we couldn't extract any useful information
     if len(details) <= 1:  # Only manufacturer is set
         return None
     
     return details
 
-def extract_endpoint_details(endpoint, username=None, password=None):
+def _add_web_page_details(details, endpoint, username, password, http_get):
     """
-    Extract detailed information from a video endpoint.
+    Identify an endpoint from its web page and add what the page reveals to details.
     
     Args:
+        details (dict): Endpoint details to update in place
         endpoint (dict): Dictionary containing endpoint information
-                        (ip, hostname, open_ports, type)
         username (str): Username for authentication
         password (str): Password for authentication
-        
-    Returns:
-        dict: Dictionary with detailed endpoint information including:
-              manufacturer, model, make, uri, sw_version, etc.
+        http_get (callable): Function to fetch the page with
     """
-    # Initialize details with the IP, hostname and type
-    details = {
-        'ip': endpoint['ip'],
-        'hostname': endpoint.get('hostname', endpoint['ip']),
-        'manufacturer': 'Unknown',
-        'model': 'Unknown',
-        'sw_version': 'Unknown',
-        'uri': f"https://{endpoint['ip']}",
-        'type': endpoint['type'],
-        'name': f"Device at {endpoint['ip']}"
-    }
-    
-    # Don't proceed if not a video endpoint
-    if endpoint['type'] != 'video_endpoint':
-        return details
-    
-    # Set default username/password if none provided
-    if username is None or password is None:
-        username = 'admin'
-        password = 'TANDBERG'
-    
-    # Try to access the web interface
     html_content = ""
     try:
         # Build the URL
         url = f"https://{endpoint['ip']}"
         print(f"DEBUG: Requesting endpoint details from {url}")
         
-        # Send the request
-        response = requests.get(
+        # Send the request, streaming so only the head of the page is downloaded
+        response = http_get(
             url,
             auth=(username, password),
             timeout=5,
-            verify=False
+            verify=False,
+            stream=True
         )
         
         if response.status_code == 200:
             print(f"DEBUG: Successfully retrieved content from {url}")
-            html_content = response.text
+            html_content = _read_html_head(response)
             print(f"DEBUG: Content preview: {html_content[:200]}...")
             
             # Look for useful title content
-            title_match = re.search(r'<title>(.*?)</title>', html_content, re.IGNORECASE)
+            title_match = _TITLE_RE.search(html_content)
             if title_match:
                 print(f"DEBUG: Found page title: {title_match.group(1)}")
             
             # Check for common keywords
-            if "cisco" in html_content.lower():
-                print(f"DEBUG: Found 'cisco' in content")
-                details['manufacturer'] = 'Cisco'
-            if "webex" in html_content.lower():
-                print(f"DEBUG: Found 'webex' in content")
-                details['manufacturer'] = 'Cisco'
-            if "tandberg" in html_content.lower():
-                print(f"DEBUG: Found 'tandberg' in content")
-                details['manufacturer'] = 'TANDBERG'
-            if "polycom" in html_content.lower():
-                print(f"DEBUG: Found 'polycom' in content")
-                details['manufacturer'] = 'Polycom'
-            if "room" in html_content.lower():
+            content_lower = html_content.lower()
+            for keyword, manufacturer in _MANUFACTURER_KEYWORDS:
+                if keyword in content_lower:
+                    print(f"DEBUG: Found '{keyword}' in content")
+                    details['manufacturer'] = manufacturer
+            if "room" in content_lower:
                 print(f"DEBUG: Found 'room' in content")
             
             # Extract more details based on the detected manufacturer
@@ -291,59 +525,161 @@ def extract_endpoint_details(endpoint, username=None, password=None):
             
     except Exception as e:
         print(f"DEBUG: Error requesting details: {str(e)}")
+
+def extract_endpoint_details(endpoint, username=None, password=None, prefer_xml=True, http_get=None):
+    """
+    Extract detailed information from a video endpoint.
     
-    # For Cisco endpoints or any endpoints with port 443 open, try the Cisco XML API
-    # This provides more details, including system name, SIP URI, etc.
-    try_xml_api = False
-    
-    # Try XML API if we identified Cisco from HTML
-    if details['manufacturer'] == 'Cisco':
-        try_xml_api = True
-    # Or if we couldn't identify the manufacturer but the device has port 443 open
-    elif details['manufacturer'] == 'Unknown' and 443 in endpoint.get('open_ports', []):
-        try_xml_api = True
+    Args:
+        endpoint (dict): Dictionary containing endpoint information
+                        (ip, hostname, open_ports, type)
+        username (str): Username for authentication
+        password (str): Password for authentication
+        prefer_xml (bool): For endpoints with HTTPS open, query the Cisco XML API
+                           before the web page, and skip the page when the XML
+                           API already identifies the device
+        http_get (callable): Optional replacement for requests.get() to fetch
+                             the web page and XML API with
         
-    if try_xml_api:
+    Returns:
+        dict: Dictionary with detailed endpoint information including:
+              manufacturer, model, make, uri, sw_version, etc.
+    """
+    # Initialize details with the IP, hostname and type
+    details = {
+        'ip': endpoint['ip'],
+        'hostname': endpoint.get('hostname', endpoint['ip']),
+        'manufacturer': 'Unknown',
+        'model': 'Unknown',
+        'sw_version': 'Unknown',
+        'uri': f"https://{endpoint['ip']}",
+        'type': endpoint['type'],
+        'name': f"Device at {endpoint['ip']}"
+    }
+    
+    # Don't proceed if not a video endpoint
+    if endpoint['type'] != 'video_endpoint':
+        return details
+    
+    # Set default username/password if none provided
+    if username is None or password is None:
+        username = 'admin'
+        password = 'TANDBERG'
+    
+    # Reuse recent details for an endpoint that was just classified, when the
+    # details cache is turned on
+    use_cache = DETAILS_CACHE_TTL > 0
+    if use_cache:
+        cache_key = _details_cache_key(endpoint, username, password)
+        with _details_cache_lock:
+            cached = _details_cache.get(cache_key)
+            if cached is not None and time.monotonic() - cached[0] < DETAILS_CACHE_TTL:
+                _details_cache.move_to_end(cache_key)
+            else:
+                cached = None
+        if cached is not None:
+            # Not on stdout, which carries the --json output
+            print(f"DEBUG: Using cached details for {endpoint['ip']}", file=sys.stderr)
+            return copy.deepcopy(cached[1])
+    
+    # Looked up several times below
+    open_ports = frozenset(endpoint.get('open_ports', ()))
+    http_get = http_get or _http_get
+    
+    # The scanner only reports ports it could connect to. Without either web
+    # port on record, make sure the web interface answers before requesting it.
+    if 443 not in open_ports and 80 not in open_ports:
+        reachable_ports = _reachable_web_ports(endpoint['ip'])
+        if not reachable_ports:
+            print(f"DEBUG: {endpoint['ip']} is not accepting connections on ports 443 or 80, skipping")
+            return details
+        open_ports |= reachable_ports
+    
+    xml_details = None
+    xml_queried = False
+    
+    if prefer_xml and 443 in open_ports:
+        # Cisco endpoints, the most common kind, report everything we need
+        # through the XML API, so ask it first and skip the web page if it can.
+        # Only done over HTTPS: without the web page, the XML API is not asked
+        # for plain-HTTP devices unless they turn out to be Cisco.
         try:
-            print(f"DEBUG: Attempting to access Cisco XML API for enhanced details")
-            xml_details = access_cisco_xml_api(endpoint, username, password)
-            if xml_details:
-                # Update our details with the XML API data
-                details.update(xml_details)
-                print(f"DEBUG: Successfully enhanced details with XML API data")
+            print(f"DEBUG: Trying Cisco XML API before the web page")
+            xml_details = access_cisco_xml_api(endpoint, username, password, http_get)
         except Exception as e:
             print(f"DEBUG: Error accessing Cisco XML API: {str(e)}")
+        xml_queried = True
+    
+    if xml_details and all(xml_details.get(field) for field in _XML_IDENTIFYING_FIELDS):
+        print(f"DEBUG: Cisco XML API identified the endpoint, skipping the web page")
+        details.update(xml_details)
+    else:
+        _add_web_page_details(details, endpoint, username, password, http_get)
+        
+        # For Cisco endpoints or any endpoints with port 443 open, try the Cisco XML API
+        # This provides more details, including system name, SIP URI, etc.
+        try_xml_api = False
+        
+        # Try XML API if we identified Cisco from HTML
+        if details['manufacturer'] == 'Cisco':
+            try_xml_api = True
+        # Or if we couldn't identify the manufacturer but the device has port 443 open
+        elif details['manufacturer'] == 'Unknown' and 443 in open_ports:
+            try_xml_api = True
+        
+        if try_xml_api:
+            try:
+                print(f"DEBUG: Attempting to access Cisco XML API for enhanced details")
+                # Whatever the XML API already answered above is used as is
+                if not xml_queried:
+                    xml_details = access_cisco_xml_api(endpoint, username, password, http_get)
+                if xml_details:
+                    # Update our details with the XML API data
+                    details.update(xml_details)
+                    print(f"DEBUG: Successfully enhanced details with XML API data")
+            except Exception as e:
+                print(f"DEBUG: Error accessing Cisco XML API: {str(e)}")
     
     # Update the display name to include manufacturer and model if available
     if details['manufacturer'] != 'Unknown' and details['model'] != 'Unknown':
         details['name'] = f"{details['manufacturer']} {details['model']} at {details['hostname']}"
     
+    # Only remember endpoints that could be identified, so one that was
+    # unreachable is tried again on the next scan
+    if use_cache and details['manufacturer'] != 'Unknown':
+        entry = (time.monotonic(), copy.deepcopy(details))
+        with _details_cache_lock:
+            _details_cache[cache_key] = entry
+            _details_cache.move_to_end(cache_key)
+            while len(_details_cache) > DETAILS_CACHE_SIZE:
+                _details_cache.popitem(last=False)
+    
     return details
 
 def parse_cisco_details(html_content):
     """
     Parse HTML content from a Cisco/Webex endpoint to extract details.
     
+    Results are memoized on the page content, so re-polling an endpoint that
+    serves the same page does not parse it again.
+    
     Args:
         html_content (str): HTML content from the endpoint
         
     Returns:
         dict: Dictionary with extracted details
     """
+    # Copy so callers can't modify the cached result
+    return dict(_parse_cisco_details(html_content))
+
+@lru_cache(maxsize=CISCO_DETAILS_CACHE_SIZE)
+def _parse_cisco_details(html_content):
     details = {
         'manufacturer': 'Cisco'
     }
     
-    # Use BeautifulSoup for more robust parsing
-    try:
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(html_content, 'html.parser')
-    except ImportError:
-        # Fallback to regex if BeautifulSoup is not available
-        pass
-    
     # Parse model from title
-    title_match = re.search(r'<title>(?:Cisco)?\s*(?:Webex)?\s*(.*?)</title>', html_content, re.IGNORECASE)
+    title_match = _CISCO_TITLE_RE.search(html_content)
     if title_match:
         model = title_match.group(1).strip()
         # Don't prepend 'Webex' if it's a TelePresence model or already has Webex
@@ -351,115 +687,25 @@ def parse_cisco_details(html_content):
             model = f"Webex {model}"
         details['model'] = model
     
-    # Parse software version - using multiple patterns to match different Cisco endpoints
-    # Pattern 1: Standard span class
-    sw_version_match = re.search(r'<span class="sw-version">(.*?)</span>', html_content)
-    if sw_version_match:
-        details['sw_version'] = sw_version_match.group(1).strip()
-        
-    # Pattern 1.5: div with class sw-info (used in test data)
-    if 'sw_version' not in details:
-        sw_info_div = re.search(r'<div class="sw-info">(.*?)</div>', html_content)
-        if sw_info_div:
-            details['sw_version'] = sw_info_div.group(1).strip()
-    
-    # Pattern 2: Table layout with Software Version label
-    if 'sw_version' not in details:
-        alt_version = re.search(r'Software Version:?\s*</td>\s*<td[^>]*>(.*?)</td>', html_content, re.IGNORECASE)
-        if alt_version:
-            details['sw_version'] = alt_version.group(1).strip()
-    
-    # Pattern 3: Modern label/value with "Software:" label
-    if 'sw_version' not in details:
-        sw_label_match = re.search(r'<td[^>]*class="[^"]*label[^"]*"[^>]*>\s*Software:?\s*</td>\s*<td[^>]*class="[^"]*value[^"]*"[^>]*>\s*(.*?)\s*</td>', html_content, re.IGNORECASE)
-        if sw_label_match:
-            details['sw_version'] = sw_label_match.group(1).strip()
-            
-    # Pattern 4: Info blocks with label/value spans
-    if 'sw_version' not in details:
-        sw_block_match = re.search(r'<span[^>]*class="[^"]*info-label[^"]*"[^>]*>\s*Software:?\s*</span>\s*<span[^>]*class="[^"]*info-value[^"]*"[^>]*>\s*(.*?)\s*</span>', html_content, re.IGNORECASE)
-        if sw_block_match:
-            details['sw_version'] = sw_block_match.group(1).strip()
-    
-    # Pattern 5: Paragraph format (older models)
-    if 'sw_version' not in details:
-        p_version_match = re.search(r'<p>\s*Software version:?\s*(.*?)\s*</p>', html_content, re.IGNORECASE)
-        if p_version_match:
-            details['sw_version'] = p_version_match.group(1).strip()
-    
-    # Parse serial number using multiple patterns
-    # Pattern 1: Standard div class
-    serial_match = re.search(r'<div class="serial-number">(.*?)</div>', html_content)
-    if serial_match:
-        details['serial'] = serial_match.group(1).strip()
-        
-    # Pattern 1.5: Extract from span with 'Serial:' prefix (used in test data)
-    if 'serial' not in details:
-        serial_span = re.search(r'<span>\s*Serial:\s*(.*?)\s*</span>', html_content)
-        if serial_span:
-            details['serial'] = serial_span.group(1).strip()
-    
-    # Pattern 2: Table layout with Serial Number label
-    if 'serial' not in details:
-        alt_serial = re.search(r'Serial Number:?\s*</td>\s*<td[^>]*>(.*?)</td>', html_content, re.IGNORECASE)
-        if alt_serial:
-            details['serial'] = alt_serial.group(1).strip()
-    
-    # Pattern 3: Modern label/value with "Serial:" or "Serial Number:" label
-    if 'serial' not in details:
-        serial_label_match = re.search(r'<td[^>]*class="[^"]*label[^"]*"[^>]*>\s*Serial(?: Number)?:?\s*</td>\s*<td[^>]*class="[^"]*value[^"]*"[^>]*>\s*(.*?)\s*</td>', html_content, re.IGNORECASE)
-        if serial_label_match:
-            details['serial'] = serial_label_match.group(1).strip()
-    
-    # Pattern 4: Info blocks with label/value spans
-    if 'serial' not in details:
-        serial_block_match = re.search(r'<span[^>]*class="[^"]*info-label[^"]*"[^>]*>\s*Serial(?: Number)?:?\s*</span>\s*<span[^>]*class="[^"]*info-value[^"]*"[^>]*>\s*(.*?)\s*</span>', html_content, re.IGNORECASE)
-        if serial_block_match:
-            details['serial'] = serial_block_match.group(1).strip()
-    
-    # Pattern 5: Paragraph format (older models)
-    if 'serial' not in details:
-        p_serial_match = re.search(r'<p>\s*Serial number:?\s*(.*?)\s*</p>', html_content, re.IGNORECASE)
-        if p_serial_match:
-            details['serial'] = p_serial_match.group(1).strip()
-    
-    # Parse MAC address using multiple patterns
-    # Pattern 1: Standard div class
-    mac_match = re.search(r'<div class="mac-address">(.*?)</div>', html_content)
-    if mac_match:
-        details['mac_address'] = mac_match.group(1).strip()
-        
-    # Pattern 1.5: Extract from span with 'MAC:' prefix (used in test data)
-    if 'mac_address' not in details:
-        mac_span = re.search(r'<span>\s*MAC:\s*(.*?)\s*</span>', html_content)
-        if mac_span:
-            details['mac_address'] = mac_span.group(1).strip()
-    
-    # Pattern 2: Table layout with MAC Address label
-    if 'mac_address' not in details:
-        alt_mac = re.search(r'MAC Address:?\s*</td>\s*<td[^>]*>(.*?)</td>', html_content, re.IGNORECASE)
-        if alt_mac:
-            details['mac_address'] = alt_mac.group(1).strip()
-    
-    # Pattern 3: Modern label/value with "MAC Address:" label
-    if 'mac_address' not in details:
-        mac_label_match = re.search(r'<td[^>]*class="[^"]*label[^"]*"[^>]*>\s*MAC Address:?\s*</td>\s*<td[^>]*class="[^"]*value[^"]*"[^>]*>\s*(.*?)\s*</td>', html_content, re.IGNORECASE)
-        if mac_label_match:
-            details['mac_address'] = mac_label_match.group(1).strip()
-    
-    # Pattern 4: Info blocks with label/value spans
-    if 'mac_address' not in details:
-        mac_block_match = re.search(r'<span[^>]*class="[^"]*info-label[^"]*"[^>]*>\s*MAC Address:?\s*</span>\s*<span[^>]*class="[^"]*info-value[^"]*"[^>]*>\s*(.*?)\s*</span>', html_content, re.IGNORECASE)
-        if mac_block_match:
-            details['mac_address'] = mac_block_match.group(1).strip()
-    
-    # Try to enhance parsing with BeautifulSoup if available and if we're missing info
-    if 'BeautifulSoup' in locals() and (not all(k in details for k in ['sw_version', 'serial']) or details.get('sw_version') == 'Unknown'):
+    # Parse software version, serial number and MAC address, trying the patterns
+    # for the different Cisco page layouts in order until one matches
+    for field, patterns in _CISCO_FIELD_PATTERNS:
+        for pattern in patterns:
+            match = pattern.search(html_content)
+            if match:
+                details[field] = match.group(1).strip()
+                break
+    
+    # Fall back to a full BeautifulSoup parse only if the patterns above missed something;
+    # building the tree is far more expensive than the regex searches
+    if not all(k in details for k in ['sw_version', 'serial']) or details.get('sw_version') == 'Unknown':
         try:
+            soup = BeautifulSoup(html_content, 'html.parser')
+            
             # Look for software version if not found
             if 'sw_version' not in details:
                 # Try to find elements containing "Software" or "Version"
-                software_elements = soup.find_all(string=re.compile(r'(?:Software|Version)', re.IGNORECASE))
+                software_elements = soup.find_all(string=_SOFTWARE_LABEL_RE)
                 for element in software_elements:
                     parent = element.parent
                     if parent and parent.name in ['td', 'span', 'div', 'p']:
@@ -470,7 +716,7 @@ def parse_cisco_details(html_content):
             
             # Look for serial if not found
             if 'serial' not in details:
-                serial_elements = soup.find_all(string=re.compile(r'Serial', re.IGNORECASE))
+                serial_elements = soup.find_all(string=_SERIAL_LABEL_RE)
                 for element in serial_elements:
                     parent = element.parent
                     if parent and parent.name in ['td', 'span', 'div', 'p']:
@@ -498,22 +744,22 @@ def parse_polycom_details(html_content):
     }
     
     # Parse model from title
-    title_match = re.search(r'<title>(?:Polycom)?\s*(.*?)</title>', html_content, re.IGNORECASE)
+    title_match = _POLYCOM_TITLE_RE.search(html_content)
     if title_match:
         details['model'] = title_match.group(1).strip()
     
     # Parse software version
-    sw_version_match = re.search(r'<div class="software-version">(.*?)</div>', html_content)
+    sw_version_match = _POLYCOM_SW_VERSION_RE.search(html_content)
     if sw_version_match:
         details['sw_version'] = sw_version_match.group(1).strip()
     else:
         # Alternative pattern
-        alt_version = re.search(r'Software:\s*</td><td[^>]*>(.*?)</td>', html_content)
+        alt_version = _SOFTWARE_TABLE_RE.search(html_content)
         if alt_version:
             details['sw_version'] = alt_version.group(1).strip()
     
     # Parse system name if available
-    name_match = re.search(r'<div class="system-name">(.*?)</div>', html_content)
+    name_match = _POLYCOM_SYSTEM_NAME_RE.search(html_content)
     if name_match:
         details['system_name'] = name_match.group(1).strip()
     
@@ -534,22 +780,22 @@ def parse_tandberg_details(html_content):
     }
     
     # Parse model from title
-    title_match = re.search(r'<title>(?:TANDBERG)?\s*(.*?)</title>', html_content, re.IGNORECASE)
+    title_match = _TANDBERG_TITLE_RE.search(html_content)
     if title_match:
         details['model'] = title_match.group(1).strip()
     
     # Parse software version
-    sw_version_match = re.search(r'<div id="sw-version">(.*?)</div>', html_content)
+    sw_version_match = _TANDBERG_SW_VERSION_RE.search(html_content)
     if sw_version_match:
         details['sw_version'] = sw_version_match.group(1).strip()
     else:
         # Alternative pattern
-        alt_version = re.search(r'Software:\s*</td><td[^>]*>(.*?)</td>', html_content)
+        alt_version = _SOFTWARE_TABLE_RE.search(html_content)
         if alt_version:
             details['sw_version'] = alt_version.group(1).strip()
     
     # Parse product ID if available
-    product_match = re.search(r'<div id="product-id">(.*?)</div>', html_content)
+    product_match = _TANDBERG_PRODUCT_ID_RE.search(html_content)
     if product_match:
         details['product_id'] = product_match.group(1).strip()
     
@@ -597,7 +843,7 @@ def parse_generic_details(html_content):
                     details['model'] = model
         
         # Look for version information in various formats
-        version_elements = soup.find_all(string=re.compile(r'(version|software|firmware|sw version)', re.IGNORECASE))
+        version_elements = soup.find_all(string=_GENERIC_VERSION_LABEL_RE)
         if version_elements:
             for element in version_elements:
                 parent = element.parent
@@ -623,15 +869,7 @@ def get_endpoint_uri(endpoint):
     Returns:
         str: URI for accessing the endpoint
     """
-    ip = endpoint['ip']
-    open_ports = endpoint.get('open_ports', [])
-    
-    # Prefer HTTPS (port 443) if available
-    if 443 in open_ports:
-        return f"https://{ip}"
-    # Fall back to HTTP (port 80) if available
-    elif 80 in open_ports:
-        return f"http://{ip}"
-    # Default to HTTP if no web ports are detected
-    else:
-        return f"http://{ip}"
+    # Prefer HTTPS (port 443) if available, otherwise HTTP whether or not
+    # port 80 was detected
+    scheme = 'https' if 443 in endpoint.get('open_ports', ()) else 'http'
+    return f"{scheme}://{endpoint['ip']}"
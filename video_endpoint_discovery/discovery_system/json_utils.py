@@ -0,0 +1,64 @@
+import re
+import json
+
+# Try to import orjson for faster serialization, but fall back to the stdlib
+try:
+    import orjson
+    HAVE_ORJSON = True
+except ImportError:
+    HAVE_ORJSON = False
+
+# orjson always writes UTF-8, while json.dumps escapes non-ASCII characters
+# (ensure_ascii). Room names are often non-ASCII, so escape them the same way
+# to keep the output identical whichever serializer is installed. (Scan
+# results hold no floats, so orjson writing NaN as null does not matter here.)
+_NON_ASCII_RE = re.compile(r'[^\x00-\x7f]')
+
+
+def _escape_char(match):
+    """Return the JSON \\u escape json.dumps uses for a non-ASCII character"""
+    code = ord(match.group())
+    if code < 0x10000:
+        return f'\\u{code:04x}'
+    # Characters outside the BMP become a UTF-16 surrogate pair
+    code -= 0x10000
+    return f'\\u{0xd800 | (code >> 10):04x}\\u{0xdc00 | (code & 0x3ff):04x}'
+
+
+def _orjson_text(obj, option):
+    """Serialize obj with orjson, escaping non-ASCII characters like json.dumps"""
+    text = orjson.dumps(obj, option=option | orjson.OPT_NON_STR_KEYS).decode()
+    if text.isascii():
+        return text
+    return _NON_ASCII_RE.sub(_escape_char, text)
+
+
+def dumps_json(obj):
+    """
+    Serialize scan results as indented JSON
+    
+    Args:
+        obj: JSON-serializable object (endpoint dict or list of endpoints)
+        
+    Returns:
+        str: JSON text indented by two spaces, with non-ASCII characters escaped
+    """
+    if HAVE_ORJSON:
+        return _orjson_text(obj, orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2)
+
+
+def dumps_json_line(obj):
+    """
+    Serialize one scan result as compact single-line JSON, for JSON Lines output
+    
+    Args:
+        obj: JSON-serializable object (usually one endpoint dict)
+        
+    Returns:
+        str: JSON text without newlines or extra whitespace, with non-ASCII
+             characters escaped
+    """
+    if HAVE_ORJSON:
+        return _orjson_text(obj, 0)
+    return json.dumps(obj, separators=(',', ':'))
@@ -1,6 +1,12 @@
 import socket
+import struct
+import errno
+import selectors
 import ipaddress
+import threading
+import itertools
 import concurrent.futures
+from functools import lru_cache
 import requests
 import urllib3
 import os
@@ -24,11 +30,38 @@ VIDEO_ENDPOINT_PORTS = [80, 443, 5060, 5061, 1720]  # HTTP, HTTPS, SIP, H.323
 # SIP ports only for first-phase scanning
 SIP_PORTS = [5060, 5061]  # SIP, SIP over TLS
 
+# Default TCP connect timeout in seconds for both scan phases. Hosts on a LAN
+# answer well within this; use a longer timeout for slow or routed networks.
+# The CLI's --connect-timeout default is this same value.
+CONNECT_TIMEOUT = 0.2
 
+# Number of recently scanned ranges whose host address strings are kept, so
+# re-scanning a range doesn't format every address again. Only IPv4 ranges of
+# a /20 or smaller are kept, bounding each entry to 4094 addresses.
+HOST_LIST_CACHE_SIZE = 8
+HOST_LIST_CACHE_MIN_PREFIXLEN = 20
+
+# connect_ex() results meaning a non-blocking connect is still under way
+_CONNECT_IN_PROGRESS = {
+    errno.EINPROGRESS,
+    errno.EWOULDBLOCK,
+    errno.EAGAIN,
+    getattr(errno, 'WSAEWOULDBLOCK', errno.EWOULDBLOCK),  # Windows
+}
+
+# Keywords in a web page or hostname that suggest a video endpoint
+VIDEO_ENDPOINT_CONTENT_KEYWORDS = ('cisco', 'polycom', 'tandberg', 'webex', 'room', 'codec')
+VIDEO_ENDPOINT_HOSTNAME_KEYWORDS = VIDEO_ENDPOINT_CONTENT_KEYWORDS + ('meeting',)
+
+
+@lru_cache(maxsize=1)
 def get_local_network_range():
     """
     Automatically detect the network range of the computer
     
+    The result is cached for the life of the process; call
+    get_local_network_range.cache_clear() to detect it again.
+    
     Returns:
         str: CIDR notation of local network (e.g., '192.168.1.0/24')
     """
@@ -85,20 +118,12 @@ def scan_ip(ip, ports=VIDEO_ENDPOINT_PORTS, timeout=0.5, force_endpoint=False, u
         dict or None: Device info if detected, None otherwise
     """
     print(f"DEBUG: Scanning IP: {ip}")
-    open_ports = []
     
-    for port in ports:
-        try:
-            print(f"DEBUG: Checking {ip}:{port}")
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(timeout)
-            result = sock.connect_ex((ip, port))
-            if result == 0:
-                print(f"DEBUG: Found open port at {ip}:{port}")
-                open_ports.append(port)
-            sock.close()
-        except Exception as e:
-            print(f"DEBUG: Error scanning {ip}:{port} - {str(e)}")
+    # Connect to every port at once, so filtered ports cost one timeout for
+    # the whole IP instead of one each
+    found = {}
+    _probe_batch([(ip, port) for port in ports], timeout, found)
+    open_ports = [port for port in ports if port in found.get(ip, ())]
     
     # If we found open ports that match video endpoint patterns
     if open_ports:
@@ -138,7 +163,8 @@ def scan_ip(ip, ports=VIDEO_ENDPOINT_PORTS, timeout=0.5, force_endpoint=False, u
                     if response.status_code == 200:
                         print(f"DEBUG: Successfully authenticated with {ip} via HTTP")
                         # Check response content for signs of a video endpoint
-                        if any(x in response.text.lower() for x in ['cisco', 'polycom', 'tandberg', 'webex', 'room', 'codec']):
+                        content = response.text.lower()
+                        if any(x in content for x in VIDEO_ENDPOINT_CONTENT_KEYWORDS):
                             print(f"DEBUG: HTTP content suggests a video endpoint")
                             is_video_endpoint = True
                 except Exception as e:
@@ -154,7 +180,8 @@ def scan_ip(ip, ports=VIDEO_ENDPOINT_PORTS, timeout=0.5, force_endpoint=False, u
                     if response.status_code == 200:
                         print(f"DEBUG: Successfully authenticated with {ip} via HTTPS")
                         # Check response content for signs of a video endpoint
-                        if any(x in response.text.lower() for x in ['cisco', 'polycom', 'tandberg', 'webex', 'room', 'codec']):
+                        content = response.text.lower()
+                        if any(x in content for x in VIDEO_ENDPOINT_CONTENT_KEYWORDS):
                             print(f"DEBUG: HTTPS content suggests a video endpoint")
                             is_video_endpoint = True
                 except Exception as e:
@@ -164,7 +191,8 @@ def scan_ip(ip, ports=VIDEO_ENDPOINT_PORTS, timeout=0.5, force_endpoint=False, u
             if not is_video_endpoint:
                 try:
                     # Check if hostname contains known video endpoint keywords
-                    if any(x in hostname.lower() for x in ['cisco', 'polycom', 'tandberg', 'webex', 'room', 'meeting', 'codec']):
+                    hostname_lower = hostname.lower()
+                    if any(x in hostname_lower for x in VIDEO_ENDPOINT_HOSTNAME_KEYWORDS):
                         print(f"DEBUG: Hostname {hostname} suggests a video endpoint")
                         is_video_endpoint = True
                 except Exception as e:
@@ -190,7 +218,181 @@ def scan_ip(ip, ports=VIDEO_ENDPOINT_PORTS, timeout=0.5, force_endpoint=False, u
     
     return None
 
-def scan_network(ip_range=None, max_workers=20, force_endpoints=None, username="admin", password="TANDBERG"):
+def _host_count(network):
+    """Number of addresses network.hosts() would yield, without iterating them"""
+    if network.version == 4 and network.prefixlen < 31:
+        # Network and broadcast addresses are excluded
+        return network.num_addresses - 2
+    if network.version == 6 and network.prefixlen < 127:
+        # The Subnet-Router anycast (network) address is excluded
+        return network.num_addresses - 1
+    return network.num_addresses
+
+# Packs an IPv4 address given as an integer into the 4-byte form inet_ntoa() takes
+_pack_ipv4 = struct.Struct('!I').pack
+
+def _iter_host_ips(network):
+    """
+    Yield the host addresses of a network as strings, in order
+    
+    IPv4 addresses are generated from integers and formatted by inet_ntoa()
+    instead of creating an IPv4Address object per host, which keeps large
+    ranges cheap.
+    
+    Args:
+        network: ipaddress.IPv4Network or IPv6Network
+        
+    Returns:
+        generator: Same addresses as network.hosts(), formatted as strings
+    """
+    if network.version == 4 and network.prefixlen < 31:
+        first = int(network.network_address) + 1
+        last = int(network.broadcast_address)
+        yield from map(socket.inet_ntoa, map(_pack_ipv4, range(first, last)))
+    else:
+        for ip in network.hosts():
+            yield str(ip)
+
+@lru_cache(maxsize=HOST_LIST_CACHE_SIZE)
+def _cached_host_ips(network):
+    return tuple(_iter_host_ips(network))
+
+def _host_ips(network):
+    """
+    Host addresses of a network as strings, reusing the list of a recently scanned range
+    
+    Args:
+        network: ipaddress.IPv4Network or IPv6Network
+        
+    Returns:
+        iterable: Same addresses as network.hosts(), formatted as strings
+    """
+    if network.version == 4 and network.prefixlen >= HOST_LIST_CACHE_MIN_PREFIXLEN:
+        return _cached_host_ips(network)
+    # Larger ranges are generated lazily; the scan streams them through
+    # probe_ports() instead of keeping every address in memory
+    return _iter_host_ips(network)
+
+# Each scanning thread keeps one selector for all of its probes, instead of
+# creating and closing an epoll/kqueue instance per batch
+_thread_state = threading.local()
+
+def _thread_selector():
+    """Return the calling thread's selector, creating it on first use"""
+    selector = getattr(_thread_state, 'selector', None)
+    if selector is None:
+        selector = _thread_state.selector = selectors.DefaultSelector()
+    return selector
+
+def _probe_batch(targets, timeout, open_ports):
+    """Connect to every (ip, port) in targets at once, recording open ports"""
+    selector = _thread_selector()
+    try:
+        for ip, port in targets:
+            try:
+                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                sock.setblocking(False)
+                result = sock.connect_ex((ip, port))
+            except Exception as e:
+                print(f"DEBUG: Error scanning {ip}:{port} - {str(e)}")
+                continue
+            
+            if result == 0:
+                # Connected straight away (e.g. loopback)
+                open_ports.setdefault(ip, set()).add(port)
+                sock.close()
+            elif result in _CONNECT_IN_PROGRESS:
+                selector.register(sock, selectors.EVENT_WRITE, (ip, port))
+            else:
+                sock.close()
+        
+        # Wait for the pending connects to complete, fail or time out
+        deadline = time.monotonic() + timeout
+        while selector.get_map():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            for key, _ in selector.select(remaining):
+                ip, port = key.data
+                selector.unregister(key.fileobj)
+                if key.fileobj.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0:
+                    open_ports.setdefault(ip, set()).add(port)
+                key.fileobj.close()
+    finally:
+        # Anything still registered timed out; leave the selector empty for
+        # the thread's next batch
+        for key in list(selector.get_map().values()):
+            selector.unregister(key.fileobj)
+            key.fileobj.close()
+
+def probe_ports(ips, ports=SIP_PORTS, timeout=0.5, max_sockets=512):
+    """
+    Check which ports are open on many IPs using non-blocking connects
+    
+    Instead of one blocking connect_ex() per (ip, port), all connection
+    attempts of a batch are started at once and completed with a single
+    selector loop, so the whole batch costs at most one timeout.
+    
+    Args:
+        ips (iterable): IP addresses to probe; read one batch at a time, so a
+                        generator over a large range is never held in memory
+        ports (list): Ports to check on each IP
+        timeout (float): Connect timeout in seconds, per batch
+        max_sockets (int): Maximum number of sockets open at the same time
+        
+    Returns:
+        dict: {ip: [open ports]} for every IP with at least one open port, with
+              IPs in the order given and ports in the order given
+    """
+    targets = ((ip, port) for ip in ips for port in ports)
+    open_ports = {}
+    probed = 0
+    
+    while True:
+        batch = list(itertools.islice(targets, max_sockets))
+        if not batch:
+            break
+        
+        # Connects complete in any order; record the batch's finds in the
+        # order the IPs were given
+        found = {}
+        _probe_batch(batch, timeout, found)
+        for ip in dict.fromkeys(ip for ip, _ in batch):
+            if ip in found:
+                open_ports.setdefault(ip, set()).update(found[ip])
+        
+        probed += len(batch)
+        print(f"DEBUG: Progress: {probed} ports probed")
+    
+    return {ip: [port for port in ports if port in found] for ip, found in open_ports.items()}
+
+def find_alive_hosts(ips, ports=VIDEO_ENDPOINT_PORTS, timeout=0.3, max_concurrency=256):
+    """
+    Quickly pre-scan IP addresses for any open endpoint port
+    
+    All ports of an address are tried at once with non-blocking connects (see
+    probe_ports()), so a dead address costs a single short timeout instead of
+    one timeout per port plus the HTTP probes that would follow.
+    
+    Args:
+        ips (list): IP addresses to check
+        ports (list): Ports to try on each IP; the first open one is enough
+        timeout (float): Connect timeout in seconds, per batch of attempts
+        max_concurrency (int): Maximum number of simultaneous connection attempts
+    
+    Returns:
+        list: IPs with at least one open port, in the order given
+    """
+    ips = list(ips)
+    if not ips or not ports:
+        return []
+    
+    # Keep every port of an address in the same batch
+    max_sockets = max(max_concurrency - max_concurrency % len(ports), len(ports))
+    open_ports = probe_ports(ips, ports=ports, timeout=timeout, max_sockets=max_sockets)
+    return [ip for ip in ips if ip in open_ports]
+
+def scan_network(ip_range=None, max_workers=20, force_endpoints=None, username="admin", password="TANDBERG", connect_timeout=CONNECT_TIMEOUT):
     """
     Scan the network for devices using a two-phase approach for efficiency:
     1. First check for SIP ports only
@@ -199,14 +401,44 @@ def scan_network(ip_range=None, max_workers=20, force_endpoints=None, username="
     Args:
         ip_range (str): CIDR notation of IP range to scan (e.g. '192.168.1.0/24')
                        If None, tries to determine the local network
-        max_workers (int): Maximum number of concurrent scanning threads
+        max_workers (int): Maximum number of concurrent detailed scanning threads
         force_endpoints (list): List of IPs to force classify as video endpoints
         username (str): Username for authenticating with endpoints
         password (str): Password for authenticating with endpoints
+        connect_timeout (float): How long to wait for each TCP connect, in seconds;
+                                 unresponsive addresses cost this much
     
     Returns:
         list: List of dictionaries containing device information
     """
+    return list(iter_scan_network(
+        ip_range,
+        max_workers=max_workers,
+        force_endpoints=force_endpoints,
+        username=username,
+        password=password,
+        connect_timeout=connect_timeout
+    ))
+
+def iter_scan_network(ip_range=None, max_workers=20, force_endpoints=None, username="admin", password="TANDBERG", connect_timeout=CONNECT_TIMEOUT):
+    """
+    Scan the network like scan_network(), yielding each device as soon as its
+    detailed scan completes instead of collecting them all first
+    
+    Args:
+        ip_range (str): CIDR notation of IP range to scan (e.g. '192.168.1.0/24')
+                       If None, tries to determine the local network
+        max_workers (int): Maximum number of concurrent detailed scanning threads
+        force_endpoints (list): List of IPs to force classify as video endpoints
+        username (str): Username for authenticating with endpoints
+        password (str): Password for authenticating with endpoints
+        connect_timeout (float): How long to wait for each TCP connect, in seconds;
+                                 unresponsive addresses cost this much
+    
+    Returns:
+        generator: Dictionaries containing device information, in the order
+                   their detailed scans finish
+    """
     print("Starting optimized network scan...")
     
     # If no IP range specified, try to determine local network
@@ -219,11 +451,11 @@ def scan_network(ip_range=None, max_workers=20, force_endpoints=None, username="
     try:
         network = ipaddress.ip_network(ip_range, strict=False)
         print(f"DEBUG: Successfully parsed network: {network}")
-        host_count = sum(1 for _ in network.hosts())
+        host_count = _host_count(network)
         print(f"DEBUG: Network contains {host_count} host addresses to scan")
     except ValueError as e:
         print(f"Invalid IP range: {ip_range} - {str(e)}")
-        return []
+        return
     
     # Handle force_endpoints parameter
     if force_endpoints is None:
@@ -238,89 +470,64 @@ def scan_network(ip_range=None, max_workers=20, force_endpoints=None, username="
     print("DEBUG: Phase 1 - Scanning for SIP ports only")
     sip_responsive_ips = []
     
-    # Track progress
-    total_ips = host_count
-    completed = 0
+    # Always include forced endpoints in the second phase; probe all other IPs.
+    # The addresses are generated as probe_ports() consumes them.
+    forced = set(force_endpoints)
     
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Create tasks for first phase (SIP ports only)
-        print("DEBUG: Creating SIP scan tasks...")
-        future_to_ip = {}
-        for ip in network.hosts():
-            str_ip = str(ip)
-            # Always include forced endpoints in the second phase
-            if str_ip in force_endpoints:
+    def ips_to_probe():
+        for str_ip in _host_ips(network):
+            if str_ip in forced:
                 sip_responsive_ips.append(str_ip)
-                continue
-                
-            # Submit scan tasks for all other IPs
-            future = executor.submit(
-                scan_ip, 
-                str_ip, 
-                ports=SIP_PORTS,  # Only check SIP ports in first phase
-                timeout=0.5,
-                force_endpoint=False,
-                username=username,
-                password=password
-            )
-            future_to_ip[future] = str_ip
-        
-        print(f"DEBUG: Submitted {len(future_to_ip)} SIP scan tasks")
-        
-        # Process results as they complete
-        for future in concurrent.futures.as_completed(future_to_ip):
-            ip = future_to_ip[future]
-            completed += 1
-            if completed % 10 == 0:
-                print(f"DEBUG: Progress: {completed}/{total_ips} IPs scanned for SIP ({completed/total_ips*100:.1f}%)")
-            try:
-                result = future.result()
-                if result:
-                    print(f"DEBUG: Found SIP response at {ip}")
-                    sip_responsive_ips.append(ip)
-            except Exception as e:
-                print(f"DEBUG: Error processing SIP scan result for {ip} - {str(e)}")
+            else:
+                yield str_ip
+    
+    print(f"DEBUG: Probing up to {host_count} IPs for SIP ports")
+    open_sip_ports = probe_ports(ips_to_probe(), ports=SIP_PORTS, timeout=connect_timeout)
+    
+    for ip in open_sip_ports:
+        print(f"DEBUG: Found SIP response at {ip}")
+        sip_responsive_ips.append(ip)
     
     print(f"DEBUG: Phase 1 complete. Found {len(sip_responsive_ips)} IPs responding to SIP")
     
     # Phase 2: Detailed scan of IPs that responded to SIP
     print("DEBUG: Phase 2 - Detailed scan of SIP-responsive IPs")
-    devices = []
     completed = 0
     total_phase2 = len(sip_responsive_ips)
     
     with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Create tasks for second phase (all ports, only for SIP-responsive IPs)
-        print("DEBUG: Creating detailed scan tasks...")
-        future_to_ip = {}
-        for ip in sip_responsive_ips:
-            future = executor.submit(
-                scan_ip, 
-                ip, 
-                ports=VIDEO_ENDPOINT_PORTS,  # Check all ports in second phase
-                timeout=0.5,
-                force_endpoint=ip in force_endpoints,
-                username=username,
-                password=password
-            )
-            future_to_ip[future] = ip
-        
-        print(f"DEBUG: Submitted {len(future_to_ip)} detailed scan tasks")
-        
-        # Process results as they complete
-        for future in concurrent.futures.as_completed(future_to_ip):
-            ip = future_to_ip[future]
-            completed += 1
-            if completed % 5 == 0 or completed == total_phase2:
-                print(f"DEBUG: Progress: {completed}/{total_phase2} IPs scanned in detail ({completed/total_phase2*100:.1f}%)")
-            try:
-                result = future.result()
-                if result:
-                    print(f"DEBUG: Detailed scan found device at {ip}")
-                    devices.append(result)
-            except Exception as e:
-                print(f"DEBUG: Error processing detailed scan result for {ip} - {str(e)}")
-    
-    return devices
-
-
+        # Keep at most max_workers detailed scans submitted at a time, topping
+        # the window up as scans finish, instead of queueing every IP up front
+        print("DEBUG: Running detailed scan tasks...")
+        pending = {}
+        ips = iter(sip_responsive_ips)
+        while True:
+            for ip in itertools.islice(ips, max_workers - len(pending)):
+                future = executor.submit(
+                    scan_ip, 
+                    ip, 
+                    ports=VIDEO_ENDPOINT_PORTS,  # Check all ports in second phase
+                    timeout=connect_timeout,
+                    force_endpoint=ip in forced,
+                    username=username,
+                    password=password
+                )
+                pending[future] = ip
+            
+            if not pending:
+                break
+            
+            # Process results as they complete
+            done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                ip = pending.pop(future)
+                completed += 1
+                if completed % 5 == 0 or completed == total_phase2:
+                    print(f"DEBUG: Progress: {completed}/{total_phase2} IPs scanned in detail ({completed/total_phase2*100:.1f}%)")
+                try:
+                    result = future.result()
+                    if result:
+                        print(f"DEBUG: Detailed scan found device at {ip}")
+                        yield result
+                except Exception as e:
+                    print(f"DEBUG: Error processing detailed scan result for {ip} - {str(e)}")
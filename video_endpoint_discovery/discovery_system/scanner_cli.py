@@ -6,7 +6,6 @@ Command-line tool to scan the local network for video conferencing endpoints.
 """
 
 import argparse
-import json
 import sys
 import os
 from pathlib import Path
@@ -19,7 +18,9 @@ if __name__ == "__main__":
 
 # Import the necessary functions
 from discovery_system.discover import find_endpoints
-from discovery_system.network_utils import get_local_network_range
+from discovery_system.endpoint_details import close_session
+from discovery_system.network_utils import CONNECT_TIMEOUT
+from discovery_system.json_utils import dumps_json, dumps_json_line
 
 
 def parse_arguments():
@@ -37,6 +38,11 @@ def parse_arguments():
         action="store_true", 
         help="Output results in JSON format"
     )
+    parser.add_argument(
+        "--json-stream",
+        action="store_true",
+        help="Output results as JSON Lines, writing each endpoint as soon as it is found"
+    )
     parser.add_argument(
         "--simple", 
         action="store_true", 
@@ -59,6 +65,13 @@ def parse_arguments():
         dest="password",
         help="Password for authenticating with endpoints (default: TANDBERG)"
     )
+    parser.add_argument(
+        "--connect-timeout",
+        dest="connect_timeout",
+        type=float,
+        default=CONNECT_TIMEOUT,
+        help=f"Seconds to wait for each TCP connect while scanning (default: {CONNECT_TIMEOUT})"
+    )
     
     # Parse the arguments
     args = parser.parse_args()
@@ -72,41 +85,51 @@ def parse_arguments():
     return args
 
 
-def display_endpoints(endpoints, json_output=False):
+def display_endpoints(endpoints, json_output=False, json_stream=False):
     """Display the found endpoints in the specified format"""
+    if json_stream:
+        # Write each endpoint as soon as the scan hands it over instead of
+        # building one document for all of them; no endpoints means no lines
+        for endpoint in endpoints:
+            print(dumps_json_line(endpoint), flush=True)
+        return
+    
     if not endpoints:
         print("No video endpoints found on the network.")
         return
     
     if json_output:
         # Output only the JSON data with no other text
-        print(json.dumps(endpoints, indent=2))
+        print(dumps_json(endpoints))
     else:
-        # Output in human-readable format
-        print(f"Found {len(endpoints)} video endpoint(s):")
-        print("-" * 50)
+        # Output in human-readable format, collected into one write instead
+        # of a print call per line
+        separator = "-" * 50
+        lines = [f"Found {len(endpoints)} video endpoint(s):", separator]
         
         for i, endpoint in enumerate(endpoints, 1):
-            print(f"Endpoint {i}:")
-            print(f"  Name: {endpoint['name']}")
-            print(f"  IP: {endpoint['ip']}")
+            lines.append(f"Endpoint {i}:")
+            lines.append(f"  Name: {endpoint['name']}")
+            lines.append(f"  IP: {endpoint['ip']}")
             
             if 'hostname' in endpoint:
-                print(f"  Hostname: {endpoint['hostname']}")
+                lines.append(f"  Hostname: {endpoint['hostname']}")
                 
             if 'open_ports' in endpoint:
-                print(f"  Open Ports: {', '.join(map(str, endpoint['open_ports']))}")
+                lines.append(f"  Open Ports: {', '.join(map(str, endpoint['open_ports']))}")
                 
             if 'model' in endpoint:
-                print(f"  Model: {endpoint['model']}")
+                lines.append(f"  Model: {endpoint['model']}")
                 
             if 'status' in endpoint:
-                print(f"  Status: {endpoint['status']}")
+                lines.append(f"  Status: {endpoint['status']}")
                 
             if 'capabilities' in endpoint:
-                print(f"  Capabilities: {', '.join(endpoint['capabilities'])}")
+                lines.append(f"  Capabilities: {', '.join(endpoint['capabilities'])}")
                 
-            print("-" * 50)
+            lines.append(separator)
+        
+        sys.stdout.write('\n'.join(lines) + '\n')
 
 
 def main():
@@ -116,7 +139,9 @@ def main():
     # If no IP range specified, auto-detect the local network range
     ip_range = args.ip_range
     if not ip_range:
-        ip_range = get_local_network_range()
+        # Look the function up on its module so mock patches apply
+        import discovery_system.network_utils
+        ip_range = discovery_system.network_utils.get_local_network_range()
         print(f"Auto-detected network range: {ip_range}")
         
     # All scans now use the optimized approach by default
@@ -129,16 +154,29 @@ def main():
     # For testing compatibility, we need to make sure we're using the correct import
     # This allows our mock patches to work correctly
     import discovery_system.discover
-    endpoints = discovery_system.discover.find_endpoints(
-        ip_range=ip_range, 
-        include_details=not args.simple,
-        force_endpoints=args.force_endpoints,
-        username=args.username,
-        password=args.password
-    )
     
-    # Display results
-    display_endpoints(endpoints, json_output=args.json)
+    # JSON Lines output is written while the scan runs, so take the endpoints
+    # one by one as they are found instead of waiting for the full list
+    if args.json_stream:
+        scan = discovery_system.discover.iter_endpoints
+    else:
+        scan = discovery_system.discover.find_endpoints
+    
+    try:
+        endpoints = scan(
+            ip_range=ip_range, 
+            include_details=not args.simple,
+            force_endpoints=args.force_endpoints,
+            username=args.username,
+            password=args.password,
+            connect_timeout=args.connect_timeout
+        )
+        
+        # Display results
+        display_endpoints(endpoints, json_output=args.json, json_stream=args.json_stream)
+    finally:
+        # The scan is over, so release the keep-alive connections to endpoints
+        close_session()
     
     return 0
 
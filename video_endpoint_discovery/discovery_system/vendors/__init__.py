@@ -0,0 +1,45 @@
+"""
+Vendor Modules
+--------------
+Manufacturer-specific helpers for extracting details from video endpoints.
+"""
+
+import threading
+import concurrent.futures
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Shared session for the vendor modules, so the API paths probed on an
+# endpoint reuse a pooled keep-alive connection instead of paying a new
+# TCP/TLS handshake for every request
+SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=64, pool_maxsize=64, max_retries=0)
+SESSION.mount('https://', _ADAPTER)
+SESSION.mount('http://', _ADAPTER)
+
+# Shared pool for the requests made concurrently to one endpoint (API paths,
+# status.xml and config.xml). Its callers usually run on classification
+# worker threads already, so a pool per call would start and join threads for
+# every endpoint. Only single requests are submitted to it, never work that
+# waits on the pool itself, so a busy pool just queues them. It is created on
+# first use, so importing the vendor modules starts no pool.
+IO_WORKERS = 32
+_IO_EXECUTOR = None
+_IO_EXECUTOR_LOCK = threading.Lock()
+
+def get_io_executor():
+    """
+    Return the shared I/O executor, creating it on first use
+    
+    Returns:
+        ThreadPoolExecutor: Executor with IO_WORKERS threads at most
+    """
+    global _IO_EXECUTOR
+    with _IO_EXECUTOR_LOCK:
+        if _IO_EXECUTOR is None:
+            _IO_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+                max_workers=IO_WORKERS,
+                thread_name_prefix='endpoint-io'
+            )
+        return _IO_EXECUTOR
@@ -5,14 +5,27 @@ Extract details from Polycom video conferencing endpoints.
 """
 
 import re
-import requests
 import urllib3
 import json
 from bs4 import BeautifulSoup
 
+from discovery_system.vendors import SESSION, get_io_executor
+
 # Disable SSL warnings for self-signed certificates
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# Page patterns, compiled once at import instead of on every parse
+_TITLE_RE = re.compile(r'<title>(?:Polycom)?\s*(.*?)</title>', re.IGNORECASE)
+_SW_VERSION_DIV_RE = re.compile(r'<div class="software-version">(.*?)</div>')
+_SW_VERSION_LABEL_RE = re.compile(r'Software\s+Version\s*:\s*([^<>\n]+)', re.IGNORECASE)
+_SYSTEM_NAME_RE = re.compile(r'<div class="system-name">(.*?)</div>')
+_SERIAL_RE = re.compile(r'Serial\s+Number\s*:\s*([^<>\n]+)', re.IGNORECASE)
+_MAC_RE = re.compile(r'MAC\s+Address\s*:\s*([^<>\n]+)', re.IGNORECASE)
+
+# Label text searched for in the BeautifulSoup fallback
+_SW_VERSION_TEXT_RE = re.compile(r'Software\s+Version', re.IGNORECASE)
+_SERIAL_TEXT_RE = re.compile(r'Serial\s+Number', re.IGNORECASE)
+
 def parse_polycom_details(html_content):
     """
     Parse HTML content from a Polycom endpoint to extract details.
@@ -28,34 +41,34 @@ def parse_polycom_details(html_content):
     }
     
     # Parse model from title
-    title_match = re.search(r'<title>(?:Polycom)?\s*(.*?)</title>', html_content, re.IGNORECASE)
+    title_match = _TITLE_RE.search(html_content)
     if title_match:
         details['model'] = title_match.group(1).strip()
     
     # Parse software version - try multiple patterns
     # Pattern 1: div with class software-version (used in tests)
-    sw_version_match = re.search(r'<div class="software-version">(.*?)</div>', html_content)
+    sw_version_match = _SW_VERSION_DIV_RE.search(html_content)
     if sw_version_match:
         details['sw_version'] = sw_version_match.group(1).strip()
     
     # Pattern 2: Standard label format
     if 'sw_version' not in details:
-        sw_version_match = re.search(r'Software\s+Version\s*:\s*([^<>\n]+)', html_content, re.IGNORECASE)
+        sw_version_match = _SW_VERSION_LABEL_RE.search(html_content)
         if sw_version_match:
             details['sw_version'] = sw_version_match.group(1).strip()
             
     # Extract system name if available (used in tests)
-    system_name_match = re.search(r'<div class="system-name">(.*?)</div>', html_content)
+    system_name_match = _SYSTEM_NAME_RE.search(html_content)
     if system_name_match:
         details['system_name'] = system_name_match.group(1).strip()
     
     # Parse serial number
-    serial_match = re.search(r'Serial\s+Number\s*:\s*([^<>\n]+)', html_content, re.IGNORECASE)
+    serial_match = _SERIAL_RE.search(html_content)
     if serial_match:
         details['serial'] = serial_match.group(1).strip()
     
     # Parse MAC address
-    mac_match = re.search(r'MAC\s+Address\s*:\s*([^<>\n]+)', html_content, re.IGNORECASE)
+    mac_match = _MAC_RE.search(html_content)
     if mac_match:
         details['mac_address'] = mac_match.group(1).strip()
     
@@ -74,7 +87,7 @@ def parse_polycom_details(html_content):
             
             # Look for software version
             if 'sw_version' not in details:
-                sw_version_element = soup.find(string=re.compile(r'Software\s+Version', re.IGNORECASE))
+                sw_version_element = soup.find(string=_SW_VERSION_TEXT_RE)
                 if sw_version_element:
                     parent = sw_version_element.parent
                     if parent and parent.next_sibling:
@@ -84,7 +97,7 @@ def parse_polycom_details(html_content):
             
             # Look for serial number
             if 'serial' not in details:
-                serial_element = soup.find(string=re.compile(r'Serial\s+Number', re.IGNORECASE))
+                serial_element = soup.find(string=_SERIAL_TEXT_RE)
                 if serial_element:
                     parent = serial_element.parent
                     if parent and parent.next_sibling:
@@ -233,19 +246,28 @@ def extract_polycom_api_details(endpoint, username="admin", password="admin"):
         "/api/rest/system"          # Alternative API path
     ]
     
-    # Try each API endpoint
+    # Request every API endpoint at once; each is a separate round trip to
+    # the same device, so waiting for them one after another only adds latency
+    io_executor = get_io_executor()
+    futures = []
     for api_path in api_endpoints:
         api_url = f"{base_url}{api_path}"
         print(f"DEBUG: Trying Polycom API at {api_url}")
+        futures.append(io_executor.submit(
+            SESSION.get,
+            api_url,
+            auth=(username, password),
+            timeout=5,
+            verify=False,
+            headers={'Accept': 'application/json'}
+        ))
+    
+    # Use the responses in the order the API endpoints are listed
+    for api_path, future in zip(api_endpoints, futures):
+        api_url = f"{base_url}{api_path}"
         
         try:
-            response = requests.get(
-                api_url,
-                auth=(username, password),
-                timeout=5,
-                verify=False,
-                headers={'Accept': 'application/json'}
-            )
+            response = future.result()
             
             if response.status_code == 200:
                 print(f"DEBUG: Successfully accessed Polycom API at {api_url}")
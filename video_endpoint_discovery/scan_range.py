@@ -15,6 +15,7 @@ if parent_dir not in sys.path:
 
 from discovery_system.discover import find_endpoints
 from discovery_system.endpoint_details import extract_endpoint_details
+from discovery_system.network_utils import find_alive_hosts
 
 def scan_ip_range(start_ip, end_ip, username="admin", password="TANDBERG"):
     """Scan a range of IP addresses and force them to be classified as endpoints"""
@@ -27,6 +28,13 @@ def scan_ip_range(start_ip, end_ip, username="admin", password="TANDBERG"):
     for octet in range(start_octet, end_octet + 1):
         force_endpoints.append(f"{ip_prefix}.{octet}")
     
+    # Skip addresses with nothing listening before the slower detailed scan
+    alive_ips = find_alive_hosts(force_endpoints)
+    skipped = [ip for ip in force_endpoints if ip not in alive_ips]
+    if skipped:
+        print(f"Skipping IPs with no open endpoint ports: {skipped}")
+    force_endpoints = alive_ips
+    
     print(f"Scanning and forcing classification of IPs: {force_endpoints}")
     
     # Run the scan with forced endpoint classification
@@ -5,7 +5,7 @@ Focuses on using the enhanced Cisco XML API detection
 """
 
 import sys
-import json
+import concurrent.futures
 from pathlib import Path
 import urllib3
 import argparse
@@ -18,8 +18,23 @@ if parent_dir not in sys.path:
 # Disable SSL warnings for self-signed certificates
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-from discovery_system.endpoint_details import extract_endpoint_details
+from discovery_system.endpoint_details import extract_endpoint_details, close_session
 from discovery_system.network_utils import scan_ip
+from discovery_system.json_utils import dumps_json
+
+# Optional detail fields printed after the basic information, as (label, key)
+DETAIL_FIELDS = [
+    ("Serial Number", "serial"),
+    ("MAC Address", "mac_address"),
+    ("System Name", "system_name"),
+    ("SIP URI", "sip_uri"),
+    ("SIP Status", "sip_status"),
+    ("Product Type", "product_type"),
+    ("IP Address (from XML)", "ip_address"),
+    ("Gateway", "gateway"),
+    ("Subnet Mask", "subnet_mask"),
+    ("System Time", "system_time"),
+]
 
 def scan_single_endpoint(ip, username="admin", password="TANDBERG", verbose=False):
     """
@@ -47,84 +62,104 @@ def scan_single_endpoint(ip, username="admin", password="TANDBERG", verbose=Fals
     # If it is a video endpoint, extract detailed information
     print(f"Video endpoint detected at {ip}. Extracting details...")
     
-    # Try different common credentials if needed
-    credentials_to_try = [
-        (username, password),  # User-provided credentials first
+    # Try different common credentials if needed, user-provided ones first.
+    # dict.fromkeys drops duplicates while keeping that order.
+    credentials_to_try = list(dict.fromkeys([
+        (username, password),  # User-provided credentials
         ("admin", "TANDBERG"),  # Default Cisco credentials
         ("admin", "admin"),     # Common alternative
         ("admin", ""),          # Empty password
         ("", ""),               # No credentials
-    ]
+    ]))
     
-    # Try each set of credentials
-    best_details = None
-    for cred_username, cred_password in credentials_to_try:
-        if cred_username == username and cred_password == password and best_details:
-            # Skip user-provided credentials if already tried
-            continue
-            
+    def try_credentials(cred_username, cred_password):
         print(f"Trying credentials: {cred_username}:{cred_password}")
-        details = extract_endpoint_details(scan_result, cred_username, cred_password)
+        return cred_username, cred_password, extract_endpoint_details(scan_result, cred_username, cred_password)
+    
+    def is_useful(details):
+        return details.get('manufacturer') != 'Unknown' or details.get('model') != 'Unknown'
+    
+    # The user's credentials go first, on their own, so the common defaults
+    # are only sent to the endpoint when those don't work
+    best_details = None
+    details = None
+    try:
+        _, _, details = try_credentials(*credentials_to_try[0])
+    except Exception as e:
+        print(f"Error extracting details: {str(e)}")
+    
+    if details is not None and is_useful(details):
+        best_details = details
+        print(f"Successfully extracted details using {username}:{password}")
+    else:
+        if details is not None:
+            print(f"Failed to extract meaningful details with {username}:{password}")
         
-        # If we got some useful information, keep it
-        if details and details.get('manufacturer') != 'Unknown' or details.get('model') != 'Unknown':
-            best_details = details
-            print(f"Successfully extracted details using {cred_username}:{cred_password}")
-            break
-        else:
-            print(f"Failed to extract meaningful details with {cred_username}:{cred_password}")
-    
-    # If no credentials worked well, use the last attempt
+        # The fallback attempts are independent, so run them at once, but
+        # accept the first useful result in the order above rather than
+        # whichever finishes first
+        fallbacks = credentials_to_try[1:]
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(fallbacks))
+        try:
+            futures = [executor.submit(try_credentials, u, p) for u, p in fallbacks]
+            for future in futures:
+                try:
+                    cred_username, cred_password, details = future.result()
+                except Exception as e:
+                    print(f"Error extracting details: {str(e)}")
+                    continue
+                
+                # If we got some useful information, keep it
+                if is_useful(details):
+                    best_details = details
+                    print(f"Successfully extracted details using {cred_username}:{cred_password}")
+                    break
+                else:
+                    print(f"Failed to extract meaningful details with {cred_username}:{cred_password}")
+        finally:
+            # Don't wait for attempts whose result is no longer needed
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    # If no credentials worked well, use the last attempt in the order above
+    # that returned details
     if not best_details:
         best_details = details
     
+    if best_details is None:
+        print(f"Could not extract details from {ip}")
+        return None
+    
     # No need to restore verbosity as we're not using urllib3.get_logger()
     
-    # Format and print the detailed output
-    print("\nEndpoint Details:")
-    print("--------------------------------------------------")
-    print(f"IP Address: {best_details.get('ip')}")
-    print(f"Manufacturer: {best_details.get('manufacturer', 'Unknown')}")
-    print(f"Model: {best_details.get('model', 'Unknown')}")
-    print(f"Software Version: {best_details.get('sw_version', 'Unknown')}")
-    
-    # Print additional details if available
-    if 'serial' in best_details:
-        print(f"Serial Number: {best_details.get('serial')}")
-    if 'mac_address' in best_details:
-        print(f"MAC Address: {best_details.get('mac_address')}")
-    if 'system_name' in best_details:
-        print(f"System Name: {best_details.get('system_name')}")
-    if 'sip_uri' in best_details:
-        print(f"SIP URI: {best_details.get('sip_uri')}")
-    if 'sip_status' in best_details:
-        print(f"SIP Status: {best_details.get('sip_status')}")
-    if 'product_type' in best_details:
-        print(f"Product Type: {best_details.get('product_type')}")
-    if 'ip_address' in best_details:
-        print(f"IP Address (from XML): {best_details.get('ip_address')}")
-    if 'gateway' in best_details:
-        print(f"Gateway: {best_details.get('gateway')}")
-    if 'subnet_mask' in best_details:
-        print(f"Subnet Mask: {best_details.get('subnet_mask')}")
-    if 'system_time' in best_details:
-        print(f"System Time: {best_details.get('system_time')}")
-    
-    # Print camera information if available
+    # Format the detailed output and write it in one go
+    lines = [
+        "\nEndpoint Details:",
+        "--------------------------------------------------",
+        f"IP Address: {best_details.get('ip')}",
+        f"Manufacturer: {best_details.get('manufacturer', 'Unknown')}",
+        f"Model: {best_details.get('model', 'Unknown')}",
+        f"Software Version: {best_details.get('sw_version', 'Unknown')}",
+    ]
+    
+    # Add additional details if available
+    lines.extend(f"{label}: {best_details[key]}" for label, key in DETAIL_FIELDS if key in best_details)
+    
+    # Add camera information if available
     if 'cameras' in best_details:
-        print("\nConnected Cameras:")
+        lines.append("\nConnected Cameras:")
         for i, camera in enumerate(best_details['cameras']):
-            print(f"  Camera #{i+1}:")
-            print(f"    Model: {camera.get('model', 'Unknown')}")
+            lines.append(f"  Camera #{i+1}:")
+            lines.append(f"    Model: {camera.get('model', 'Unknown')}")
             if 'serial_number' in camera:
-                print(f"    Serial: {camera.get('serial_number')}")
-            print(f"    Connected: {camera.get('connected', False)}")
+                lines.append(f"    Serial: {camera.get('serial_number')}")
+            lines.append(f"    Connected: {camera.get('connected', False)}")
     
-    print("--------------------------------------------------")
+    lines.append("--------------------------------------------------")
+    sys.stdout.write("\n".join(lines) + "\n")
     
     # Return the complete details as JSON
     print("\nComplete JSON Output:")
-    print(json.dumps(best_details, indent=2))
+    print(dumps_json(best_details))
     
     return best_details
 
@@ -138,10 +173,13 @@ if __name__ == "__main__":
     
     args = parser.parse_args()
     
-    # Scan the specified endpoint
-    scan_single_endpoint(
-        ip=args.ip,
-        username=args.username,
-        password=args.password,
-        verbose=args.verbose
-    )
+    # Scan the specified endpoint, then release its keep-alive connections
+    try:
+        scan_single_endpoint(
+            ip=args.ip,
+            username=args.username,
+            password=args.password,
+            verbose=args.verbose
+        )
+    finally:
+        close_session()
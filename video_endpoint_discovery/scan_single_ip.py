@@ -4,7 +4,6 @@ Script to scan a single IP address and extract detailed endpoint information
 """
 
 import sys
-import json
 from pathlib import Path
 
 # Add parent directory to path if running as a script
@@ -13,6 +12,7 @@ if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
 from discovery_system.endpoint_details import extract_endpoint_details
+from discovery_system.json_utils import dumps_json
 
 def scan_single_ip(ip, username="admin", password="TANDBERG"):
     """Scan a single IP and extract detailed endpoint information"""
@@ -44,7 +44,7 @@ def scan_single_ip(ip, username="admin", password="TANDBERG"):
         details['name'] = f"{details['manufacturer']} {details['model']} at {details['system_name']}"
     
     # Output the results in JSON format
-    print(json.dumps(details, indent=2))
+    print(dumps_json(details))
     
     return details
 
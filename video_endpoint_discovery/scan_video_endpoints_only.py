@@ -4,7 +4,6 @@ Script to scan the network and only print information for devices classified as
 """
 
 import sys
-import json
 from pathlib import Path
 import urllib3
 import argparse
@@ -19,6 +18,15 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 from discovery_system.discover import find_endpoints
 from discovery_system.network_utils import get_local_network_range
+from discovery_system.json_utils import dumps_json
+
+# Optional fields printed for each endpoint, as (label, key)
+OPTIONAL_FIELDS = [
+    ("Serial", "serial"),
+    ("MAC", "mac_address"),
+    ("System Name", "system_name"),
+    ("SIP URI", "sip_uri"),
+]
 
 def scan_network_for_video_endpoints(ip_range=None, username="admin", password="TANDBERG"):
     """
@@ -42,27 +50,26 @@ def scan_network_for_video_endpoints(ip_range=None, username="admin", password="
     # Filter for video endpoints only
     video_endpoints = [ep for ep in endpoints if ep.get('type') == 'video_endpoint']
     
-    print(f"Found {len(video_endpoints)} video endpoint(s):")
-    print("--------------------------------------------------")
+    separator = "--------------------------------------------------\n"
+    chunks = [f"Found {len(video_endpoints)} video endpoint(s):\n", separator]
     
-    # Print details for each video endpoint
+    # Collect details for each video endpoint and write them out in one go
     for i, endpoint in enumerate(video_endpoints):
-        print(f"Video Endpoint #{i+1}: {endpoint.get('ip')}")
-        print(f"  Manufacturer: {endpoint.get('manufacturer', 'Unknown')}")
-        print(f"  Model: {endpoint.get('model', 'Unknown')}")
-        print(f"  Software: {endpoint.get('sw_version', 'Unknown')}")
+        chunks.append(
+            f"Video Endpoint #{i+1}: {endpoint.get('ip')}\n"
+            f"  Manufacturer: {endpoint.get('manufacturer', 'Unknown')}\n"
+            f"  Model: {endpoint.get('model', 'Unknown')}\n"
+            f"  Software: {endpoint.get('sw_version', 'Unknown')}\n"
+        )
         
-        # Print additional details if available
-        if 'serial' in endpoint:
-            print(f"  Serial: {endpoint.get('serial')}")
-        if 'mac_address' in endpoint:
-            print(f"  MAC: {endpoint.get('mac_address')}")
-        if 'system_name' in endpoint:
-            print(f"  System Name: {endpoint.get('system_name')}")
-        if 'sip_uri' in endpoint:
-            print(f"  SIP URI: {endpoint.get('sip_uri')}")
+        # Add additional details if available
+        for label, key in OPTIONAL_FIELDS:
+            if key in endpoint:
+                chunks.append(f"  {label}: {endpoint[key]}\n")
         
-        print("--------------------------------------------------")
+        chunks.append(separator)
+    
+    sys.stdout.writelines(chunks)
     
     return video_endpoints
 
@@ -86,4 +93,4 @@ if __name__ == "__main__":
     # If JSON output is requested
     if args.json:
         print("\nJSON Output:")
-        print(json.dumps(video_endpoints, indent=2))
+        print(dumps_json(video_endpoints))
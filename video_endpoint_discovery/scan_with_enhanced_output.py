@@ -4,11 +4,15 @@ Script to scan a specific endpoint and output enhanced JSON data
 """
 
 import sys
-import json
+import copy
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+import concurrent.futures
+from io import BytesIO
 from pathlib import Path
 import urllib3
-import xml.etree.ElementTree as ET
+from urllib3.response import HTTPResponse
 
 # Add parent directory to path if running as a script
 parent_dir = str(Path(__file__).parent)
@@ -19,61 +23,165 @@ if parent_dir not in sys.path:
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 from discovery_system.endpoint_details import extract_endpoint_details, access_cisco_xml_api
+# Parse endpoint XML with the same parser and safety options as the library
+from discovery_system.endpoint_details import ET, _ITERPARSE_OPTIONS
+from discovery_system.json_utils import dumps_json
+
+# Responses fetched by this script, keyed by (url, auth, other request
+# options). The XML API helpers and the debugging probes below all ask for the
+# same status.xml and config.xml, so each request is only sent once. Only this
+# script's own calls go through the cache: scan_endpoint() passes cached_get()
+# to the discovery_system functions explicitly.
+_RESPONSE_CACHE_SIZE = 256
+_response_cache = {}
+_response_cache_lock = threading.Lock()
+
+# One keep-alive session for every request made by this script, so the
+# repeated probes of the same endpoint reuse the TCP/TLS connection instead
+# of handshaking again for each URL
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=0))
+_SESSION.mount("http://", HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=0))
+_SESSION.verify = False
+
+def _replay(response):
+    """Return a copy of a fully read response whose body can be read again, also as a stream"""
+    replay = copy.copy(response)
+    replay.raw = HTTPResponse(body=BytesIO(response.content), preload_content=False)
+    return replay
+
+def cached_get(url, auth=None, **kwargs):
+    """Drop-in replacement for requests.get() that reuses earlier responses"""
+    # Every caller gets a replay of the fully read body, so streaming or not
+    # makes no difference to the cached response
+    options = tuple(sorted((name, value) for name, value in kwargs.items() if name != "stream"))
+    key = (url, auth, options)
+    with _response_cache_lock:
+        result = _response_cache.get(key)
+    
+    if result is None:
+        # Failures are not cached, so a later call tries the request again
+        result = _SESSION.get(url, auth=auth, **kwargs)
+        # Read the whole body now, even for stream=True requests: a stream
+        # can only be read once, but every caller gets its own replay of it
+        result.content
+        with _response_cache_lock:
+            if len(_response_cache) >= _RESPONSE_CACHE_SIZE:
+                _response_cache.pop(next(iter(_response_cache)))
+            _response_cache[key] = result
+    
+    return _replay(result)
+
+def _probe(url, username, password):
+    """Fetch a URL for the debugging probes, returning (response, error)"""
+    try:
+        return cached_get(url, auth=(username, password), timeout=5, verify=False), None
+    except Exception as e:
+        return None, e
+
+def _probe_all(urls, username, password):
+    """Fetch all URLs concurrently, returning {url: (response, error)}"""
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(urls)) as executor:
+        results = executor.map(lambda url: _probe(url, username, password), urls)
+        return dict(zip(urls, results))
+
+# Element path of the product ID in status.xml, relative to the root
+_PRODUCT_ID_PATH = ("SystemUnit", "ProductId")
+
+def _scan_xml(content, wanted_path=None):
+    """
+    Incrementally parse an XML document
+    
+    Args:
+        content: Raw XML bytes
+        wanted_path: Optional element path (relative to the root) to look for
+        
+    Returns:
+        Tuple of (root tag, element at wanted_path or None). Parsing stops as
+        soon as the wanted element has been read; otherwise the whole document
+        is parsed so syntax errors are still reported.
+    """
+    root_tag = None
+    path = []
+    for event, elem in ET.iterparse(BytesIO(content), events=("start", "end"), **_ITERPARSE_OPTIONS):
+        if event == "start":
+            if root_tag is None:
+                root_tag = elem.tag
+            path.append(elem.tag)
+            continue
+        
+        if wanted_path is not None and tuple(path[1:]) == wanted_path:
+            return root_tag, elem
+        path.pop()
+        # Release finished top-level subtrees as we go
+        if len(path) == 1:
+            elem.clear()
+    
+    return root_tag, None
+
+def _report_xml_probe(xml_file, url, response, error):
+    """Print the outcome of fetching and parsing one XML API file"""
+    print(f"Testing direct access to {url}...")
+    if error is not None:
+        print(f"  Error accessing {url}: {str(error)}")
+        return
+    
+    print(f"  Status code: {response.status_code}")
+    
+    if response.status_code == 200:
+        # Try parsing as XML; for status.xml we only need the ProductId
+        wanted_path = _PRODUCT_ID_PATH if xml_file == "status.xml" else None
+        try:
+            root_tag, product_id = _scan_xml(response.content, wanted_path)
+            print(f"  Successfully parsed as XML, root tag: {root_tag}")
+            
+            # For status.xml, check for expected elements
+            if xml_file == "status.xml":
+                if product_id is not None:
+                    print(f"  Found ProductId: {product_id.text}")
+                else:
+                    print("  ProductId not found")
+        except ET.ParseError as pe:
+            print(f"  XML parsing error: {str(pe)}")
+            print(f"  Content preview: {response.text[:200]}...")
 
 def test_direct_xml_api_access(ip, username="admin", password="TANDBERG"):
     """Test direct access to the XML API for debugging"""
     print(f"\nTesting direct XML API access at {ip}...")
     
+    xml_files = ["status.xml", "config.xml"]
+    base_urls = [f"{protocol}://{ip}" for protocol in ["https", "http"]]
+    https_urls = {xml_file: f"https://{ip}/{xml_file}" for xml_file in xml_files}
+    
+    # The probes are independent, so fetch the basic connectivity checks and
+    # the HTTPS XML files at the same time
+    results = _probe_all(base_urls + list(https_urls.values()), username, password)
+    
     # First test direct HTTP/HTTPS access
-    for protocol in ["https", "http"]:
-        base_url = f"{protocol}://{ip}"
-        try:
-            print(f"Testing basic connectivity to {base_url}...")
-            response = requests.get(
-                base_url,
-                auth=(username, password),
-                timeout=5,
-                verify=False
-            )
-            print(f"  Status code: {response.status_code}")
-            print(f"  Content type: {response.headers.get('Content-Type', 'Unknown')}")
-            print(f"  Content length: {len(response.text)} bytes")
-        except Exception as e:
-            print(f"  Error accessing {base_url}: {str(e)}")
-    
-    # Now try accessing the XML API directly
-    for xml_file in ["status.xml", "config.xml"]:
-        for protocol in ["https", "http"]:
-            url = f"{protocol}://{ip}/{xml_file}"
-            try:
-                print(f"Testing direct access to {url}...")
-                response = requests.get(
-                    url,
-                    auth=(username, password),
-                    timeout=5,
-                    verify=False
-                )
-                
-                print(f"  Status code: {response.status_code}")
-                
-                if response.status_code == 200:
-                    # Try parsing as XML
-                    try:
-                        root = ET.fromstring(response.text)
-                        print(f"  Successfully parsed as XML, root tag: {root.tag}")
-                        
-                        # For status.xml, check for expected elements
-                        if xml_file == "status.xml":
-                            product_id = root.find('./SystemUnit/ProductId')
-                            if product_id is not None:
-                                print(f"  Found ProductId: {product_id.text}")
-                            else:
-                                print("  ProductId not found")
-                    except ET.ParseError as pe:
-                        print(f"  XML parsing error: {str(pe)}")
-                        print(f"  Content preview: {response.text[:200]}...")
-            except Exception as e:
-                print(f"  Error accessing {url}: {str(e)}")
+    for base_url in base_urls:
+        print(f"Testing basic connectivity to {base_url}...")
+        response, error = results[base_url]
+        if error is not None:
+            print(f"  Error accessing {base_url}: {str(error)}")
+            continue
+        print(f"  Status code: {response.status_code}")
+        print(f"  Content type: {response.headers.get('Content-Type', 'Unknown')}")
+        print(f"  Content length: {len(response.text)} bytes")
+    
+    # Only fall back to plain HTTP for files HTTPS could not serve
+    http_urls = {}
+    for xml_file, url in https_urls.items():
+        response, _ = results[url]
+        if response is None or response.status_code != 200:
+            http_urls[xml_file] = f"http://{ip}/{xml_file}"
+    if http_urls:
+        results.update(_probe_all(list(http_urls.values()), username, password))
+    
+    # Now report on the XML API files
+    for xml_file in xml_files:
+        for url in (https_urls[xml_file], http_urls.get(xml_file)):
+            if url is not None:
+                _report_xml_probe(xml_file, url, *results[url])
 
 def scan_endpoint(ip, username="admin", password="TANDBERG"):
     """Scan a specific endpoint and output enhanced JSON data"""
@@ -87,21 +195,23 @@ def scan_endpoint(ip, username="admin", password="TANDBERG"):
         'open_ports': [443]
     }
     
-    # Try to access XML API directly first (for debugging)
+    # Try to access XML API directly first (for debugging). Both calls into
+    # discovery_system fetch through cached_get(), so they share one request
+    # per file.
     print("\nAttempting to access XML API directly...")
     try:
-        xml_details = access_cisco_xml_api(endpoint, username, password)
+        xml_details = access_cisco_xml_api(endpoint, username, password, http_get=cached_get)
         print("XML API access result:")
-        print(json.dumps(xml_details, indent=2))
+        print(dumps_json(xml_details))
     except Exception as e:
         print(f"Error accessing XML API: {str(e)}")
     
     # Extract detailed information using the standard method
     print("\nExtracting endpoint details using standard method...")
-    details = extract_endpoint_details(endpoint, username, password)
+    details = extract_endpoint_details(endpoint, username, password, http_get=cached_get)
     
     # Format and output the JSON with all available fields
-    formatted_json = json.dumps(details, indent=2)
+    formatted_json = dumps_json(details)
     
     print("\nEnhanced JSON Output:")
     print(formatted_json)
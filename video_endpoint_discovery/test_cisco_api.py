@@ -6,7 +6,7 @@ Test script for Cisco endpoint details extraction
 import sys
 import os
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 import json
 
 # Add the parent directory to the path
@@ -15,15 +15,14 @@ if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
 from discovery_system.endpoint_details import extract_endpoint_details, access_cisco_xml_api
+from tests._fixtures import FakeResp
 
 def test_cisco_api_integration():
     """Test the integration of Cisco XML API into endpoint details extraction"""
     
-    with patch('requests.get') as mock_requests:
+    with patch('discovery_system.endpoint_details._http_get') as mock_requests:
         # Mock successful HTML response
-        mock_html_response = MagicMock()
-        mock_html_response.status_code = 200
-        mock_html_response.text = """
+        mock_html_response = FakeResp(status_code=200, text="""
         <html>
         <head><title>Cisco Webex Room Kit</title></head>
         <body>
@@ -35,12 +34,10 @@ def test_cisco_api_integration():
             </div>
         </body>
         </html>
-        """
+        """)
         
         # Mock successful status.xml response
-        mock_status_response = MagicMock()
-        mock_status_response.status_code = 200
-        mock_status_response.text = """<?xml version="1.0"?>
+        mock_status_response = FakeResp(status_code=200, text="""<?xml version="1.0"?>
 <Status>
   <SystemUnit>
     <ProductId>Cisco Webex Room Kit</ProductId>
@@ -63,12 +60,10 @@ def test_cisco_api_integration():
       <Domain>example.com</Domain>
     </DNS>
   </Network>
-</Status>"""
+</Status>""")
         
         # Mock successful config.xml response
-        mock_config_response = MagicMock()
-        mock_config_response.status_code = 200
-        mock_config_response.text = """<?xml version="1.0"?>
+        mock_config_response = FakeResp(status_code=200, text="""<?xml version="1.0"?>
 <Configuration>
   <SystemUnit>
     <Name>Conference Room A</Name>
@@ -80,7 +75,7 @@ def test_cisco_api_integration():
   <SIP>
     <URI>room.kit@example.com</URI>
   </SIP>
-</Configuration>"""
+</Configuration>""")
         
         # Set up the mock to return our mock responses
         def mock_get_response(url, **kwargs):
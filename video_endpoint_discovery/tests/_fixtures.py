@@ -0,0 +1,47 @@
+from collections import namedtuple
+from io import BytesIO
+
+import requests
+from urllib3.response import HTTPResponse
+
+class FakeResp(namedtuple('FakeResp', 'status_code text')):
+    """
+    Stand-in for a streamed requests.Response in mocked HTTP calls.
+    
+    Much cheaper to build than a MagicMock for every call, and it exposes the
+    same body interface as a real response: text, iter_content() and a raw
+    stream to read the body from.
+    """
+    __slots__ = ()
+    
+    encoding = 'utf-8'
+    
+    @property
+    def content(self):
+        return self.text.encode(self.encoding)
+    
+    @property
+    def raw(self):
+        # A fresh stream on every access, so the body can be read again
+        return HTTPResponse(body=BytesIO(self.content), preload_content=False)
+    
+    def iter_content(self, chunk_size=1, decode_unicode=False):
+        content = self.text if decode_unicode else self.content
+        return (content[i:i + chunk_size] for i in range(0, len(content), chunk_size))
+    
+    def close(self):
+        pass
+
+
+class FakeIP(str):
+    """Stand-in for an ipaddress host in tests that only call str() on it."""
+    __slots__ = ()
+
+
+def stream_response(status_code, text):
+    """Build a real requests.Response whose body, like a streamed one, can only be read once."""
+    response = requests.Response()
+    response.status_code = status_code
+    response.encoding = 'utf-8'
+    response.raw = HTTPResponse(body=BytesIO(text.encode()), preload_content=False)
+    return response
@@ -0,0 +1,49 @@
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add the parent directory to the path so we can import discovery_system
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from discovery_system import endpoint_details
+from discovery_system.discover import clear_scan_cache
+
+
+@pytest.fixture(autouse=True)
+def fresh_scan_cache():
+    """Make sure no test sees scan results cached by another test."""
+    clear_scan_cache()
+    yield
+    clear_scan_cache()
+
+
+@pytest.fixture(autouse=True)
+def fresh_cisco_details_cache():
+    """Make sure every test parses its Cisco pages from scratch."""
+    endpoint_details._parse_cisco_details.cache_clear()
+    yield
+    endpoint_details._parse_cisco_details.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def fresh_details_cache():
+    """Make sure no test sees endpoint details cached by another test."""
+    endpoint_details.clear_details_cache()
+    yield
+    endpoint_details.clear_details_cache()
+
+
+@pytest.fixture
+def mock_http_routes():
+    """Answer endpoint HTTP requests by the last segment of the URL path.
+    
+    Call the fixture with a {segment: response} dict and the response for any
+    other URL; it returns the mock standing in for _http_get.
+    """
+    with patch('discovery_system.endpoint_details._http_get') as mock_get:
+        def install(routes, default):
+            mock_get.side_effect = lambda url, **kwargs: routes.get(url.rpartition('/')[2], default)
+            return mock_get
+        yield install
@@ -1,11 +1,8 @@
 import pytest
-import sys
-from pathlib import Path
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 import re
 
-# Add the parent directory to the path so we can import discovery_system
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from tests._fixtures import FakeResp
 
 from discovery_system.endpoint_details import (
     parse_cisco_details,
@@ -114,14 +111,12 @@ class TestCiscoEndpointParsing:
         assert result['sw_version'] == 'TC7.3.6'
         assert result['serial'] == 'FTT182700UT'
     
-    @patch('requests.get')
+    @patch('discovery_system.endpoint_details._http_get')
     def test_extract_endpoint_details_cisco_actual(self, mock_requests):
         """Test extracting details from a simulated actual Cisco endpoint."""
         # This test uses a more realistic HTML snippet that approximates
         # what we might get from a real Cisco endpoint
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.text = """
+        mock_response = FakeResp(200, """
         <!DOCTYPE html>
         <html>
         <head>
@@ -163,7 +158,7 @@ class TestCiscoEndpointParsing:
             </main>
         </body>
         </html>
-        """
+        """)
         mock_requests.return_value = mock_response
         
         endpoint = {
@@ -1,25 +1,18 @@
 import pytest
-import sys
-from pathlib import Path
-from unittest.mock import patch, MagicMock
 import re
 import json
 
-# Add the parent directory to the path so we can import discovery_system
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from tests._fixtures import FakeResp
 
 class TestCiscoXmlApi:
     """Tests for accessing and parsing Cisco endpoint XML API files (config.xml and status.xml)."""
     
-    @patch('requests.get')
-    def test_access_cisco_status_xml(self, mock_requests):
+    def test_access_cisco_status_xml(self, mock_http_routes):
         """Test accessing and parsing status.xml from a Cisco endpoint."""
         from discovery_system.endpoint_details import access_cisco_xml_api
         
         # Mock successful response for status.xml
-        mock_status_response = MagicMock()
-        mock_status_response.status_code = 200
-        mock_status_response.text = """<?xml version="1.0"?>
+        mock_status_response = FakeResp(200, """<?xml version="1.0"?>
 <Status>
   <SystemUnit>
     <ProductId>Cisco Webex Room Kit</ProductId>
@@ -42,12 +35,10 @@ class TestCiscoXmlApi:
       <Domain>example.com</Domain>
     </DNS>
   </Network>
-</Status>"""
+</Status>""")
         
         # Set up the mock to return our mock response
-        mock_requests.side_effect = lambda url, **kwargs: (
-            mock_status_response if "status.xml" in url else MagicMock(status_code=404)
-        )
+        mock_http_routes({'status.xml': mock_status_response}, FakeResp(404, ''))
         
         # Call the function to test
         endpoint = {
@@ -68,15 +59,12 @@ class TestCiscoXmlApi:
         assert result['mac_address'] == '00:11:22:33:44:55'
         assert result['product_type'] == 'Cisco Codec'
     
-    @patch('requests.get')
-    def test_access_cisco_config_xml(self, mock_requests):
+    def test_access_cisco_config_xml(self, mock_http_routes):
         """Test accessing and parsing config.xml from a Cisco endpoint."""
         from discovery_system.endpoint_details import access_cisco_xml_api
         
         # Mock successful response for config.xml
-        mock_config_response = MagicMock()
-        mock_config_response.status_code = 200
-        mock_config_response.text = """<?xml version="1.0"?>
+        mock_config_response = FakeResp(200, """<?xml version="1.0"?>
 <Configuration>
   <SystemUnit>
     <Name>Conference Room A</Name>
@@ -96,22 +84,16 @@ class TestCiscoXmlApi:
   <SIP>
     <URI>room.kit@example.com</URI>
   </SIP>
-</Configuration>"""
+</Configuration>""")
         
         # Mock 404 for status.xml to ensure we test config.xml parsing
-        mock_status_response = MagicMock()
-        mock_status_response.status_code = 404
+        mock_status_response = FakeResp(404, '')
         
         # Set up the mock to return our mock responses
-        def mock_get_response(url, **kwargs):
-            if "config.xml" in url:
-                return mock_config_response
-            elif "status.xml" in url:
-                return mock_status_response
-            else:
-                return MagicMock(status_code=404)
-        
-        mock_requests.side_effect = mock_get_response
+        mock_http_routes({
+            'status.xml': mock_status_response,
+            'config.xml': mock_config_response
+        }, FakeResp(404, ''))
         
         # Call the function to test
         endpoint = {
@@ -129,15 +111,12 @@ class TestCiscoXmlApi:
         assert result['sip_uri'] == 'room.kit@example.com'
         assert result['contact_info'] == 'IT Support (555-1234)'
     
-    @patch('requests.get')
-    def test_access_cisco_both_xml_files(self, mock_requests):
+    def test_access_cisco_both_xml_files(self, mock_http_routes):
         """Test accessing and parsing both status.xml and config.xml."""
         from discovery_system.endpoint_details import access_cisco_xml_api
         
         # Mock successful responses for both XML files
-        mock_status_response = MagicMock()
-        mock_status_response.status_code = 200
-        mock_status_response.text = """<?xml version="1.0"?>
+        mock_status_response = FakeResp(200, """<?xml version="1.0"?>
 <Status>
   <SystemUnit>
     <ProductId>Cisco Webex Desk Pro</ProductId>
@@ -152,11 +131,9 @@ class TestCiscoXmlApi:
       <MACAddress>AA:BB:CC:DD:EE:FF</MACAddress>
     </Hardware>
   </SystemUnit>
-</Status>"""
+</Status>""")
         
-        mock_config_response = MagicMock()
-        mock_config_response.status_code = 200
-        mock_config_response.text = """<?xml version="1.0"?>
+        mock_config_response = FakeResp(200, """<?xml version="1.0"?>
 <Configuration>
   <SystemUnit>
     <Name>Executive Office</Name>
@@ -164,18 +141,13 @@ class TestCiscoXmlApi:
   <SIP>
     <URI>desk.pro@example.com</URI>
   </SIP>
-</Configuration>"""
+</Configuration>""")
         
         # Set up the mock to return our mock responses
-        def mock_get_response(url, **kwargs):
-            if "config.xml" in url:
-                return mock_config_response
-            elif "status.xml" in url:
-                return mock_status_response
-            else:
-                return MagicMock(status_code=404)
-        
-        mock_requests.side_effect = mock_get_response
+        mock_http_routes({
+            'status.xml': mock_status_response,
+            'config.xml': mock_config_response
+        }, FakeResp(404, ''))
         
         # Call the function to test
         endpoint = {
@@ -196,3 +168,40 @@ class TestCiscoXmlApi:
         assert result['mac_address'] == 'AA:BB:CC:DD:EE:FF'
         assert result['system_name'] == 'Executive Office'
         assert result['sip_uri'] == 'desk.pro@example.com'
+    
+    def test_access_cisco_xml_api_uses_shared_io_threads(self, mock_http_routes):
+        """Test that the XML files are fetched on the shared I/O pool instead of new threads per call."""
+        import threading
+        from discovery_system.endpoint_details import access_cisco_xml_api
+        
+        mock_get = mock_http_routes({}, FakeResp(404, ''))
+        thread_names = []
+        
+        def record_thread(url, **kwargs):
+            thread_names.append(threading.current_thread().name)
+            return FakeResp(404, '')
+        mock_get.side_effect = record_thread
+        
+        endpoint = {'ip': '172.17.20.73', 'type': 'video_endpoint', 'open_ports': [443]}
+        for _ in range(3):
+            assert access_cisco_xml_api(endpoint, "admin", "TANDBERG") is None
+        
+        assert len(thread_names) == 6
+        assert all(name.startswith('endpoint-io') for name in thread_names)
+    
+    def test_io_executor_is_created_on_first_use(self):
+        """Test that importing the discovery modules starts no I/O pool, and that later calls share one."""
+        import subprocess
+        import sys
+        from pathlib import Path
+        from discovery_system.vendors import get_io_executor
+        
+        check = (
+            "import discovery_system.endpoint_details, discovery_system.vendors.polycom\n"
+            "from discovery_system import vendors\n"
+            "assert vendors._IO_EXECUTOR is None\n"
+        )
+        subprocess.run([sys.executable, '-c', check], cwd=Path(__file__).parent.parent, check=True)
+        
+        assert get_io_executor() is get_io_executor()
+
@@ -4,14 +4,10 @@ These tests use extensive mocking to avoid real network calls and timeout delays
 """
 
 import pytest
-import sys
+import threading
 import time
-from pathlib import Path
 from unittest.mock import patch, MagicMock
 
-# Add the parent directory to the path so we can import discovery_system
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from discovery_system.discover import find_endpoints
 from discovery_system.endpoint_classification import classify_endpoints
 
@@ -22,7 +18,7 @@ class TestEndpointClassificationSpeed:
     @patch('discovery_system.discover.scan_network')
     @patch('discovery_system.endpoint_classification.extract_endpoint_details')
     def test_classification_speed_with_multiple_workers(self, mock_extract, mock_scan):
-        """Test that the worker-based classification system is faster with multiple workers."""
+        """Test that classification runs num_workers endpoints in parallel, and no more."""
         # Create a larger set of endpoints for testing performance
         endpoints = []
         for i in range(10):  # 10 endpoints should be enough for testing
@@ -37,10 +33,21 @@ class TestEndpointClassificationSpeed:
         # Mock scan_network to return test endpoints
         mock_scan.return_value = endpoints
         
-        # Mock extract_endpoint_details to add a slight delay and return test data
+        # Mock extract_endpoint_details to add a slight delay and return test
+        # data, recording how many endpoints are being classified at once
+        lock = threading.Lock()
+        running = [0]
+        peak = [0]
+        
         def mock_extract_side_effect(endpoint, *args, **kwargs):
-            # Very small delay to simulate API call without actually being slow
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            # Small delay to simulate an API call, long enough for the
+            # other workers to start theirs
             time.sleep(0.01)
+            with lock:
+                running[0] -= 1
             return {
                 **endpoint,
                 'manufacturer': 'Test Manufacturer',
@@ -54,38 +61,32 @@ class TestEndpointClassificationSpeed:
             
         mock_extract.side_effect = mock_extract_side_effect
         
-        # First run with a single worker
-        start_time_single = time.time()
-        result_single = find_endpoints(num_workers=1)
-        end_time_single = time.time()
-        single_worker_time = end_time_single - start_time_single
+        # First run with multiple workers, which leaves idle threads in the
+        # shared pool for the single-worker run
+        result_multi = find_endpoints(num_workers=4)
+        multi_worker_peak = peak[0]
         
         # Reset mocks
         mock_scan.reset_mock()
         mock_extract.reset_mock()
         mock_scan.return_value = endpoints
         mock_extract.side_effect = mock_extract_side_effect
+        peak[0] = 0
         
-        # Run with multiple workers
-        start_time_multi = time.time()
-        result_multi = find_endpoints(num_workers=4)
-        end_time_multi = time.time()
-        multi_worker_time = end_time_multi - start_time_multi
+        # Run with a single worker
+        result_single = find_endpoints(num_workers=1)
+        single_worker_peak = peak[0]
         
         # Check that both runs found the correct endpoints
         assert len(result_single) == 10
         assert len(result_multi) == 10
         
-        # Multiple workers should be at least somewhat faster
-        # We're not asserting an exact amount because test environments vary
-        print(f"\nSingle worker time: {single_worker_time:.4f}s")
-        print(f"Multi worker time:  {multi_worker_time:.4f}s")
-        print(f"Speed improvement:  {(single_worker_time / multi_worker_time):.2f}x")
-        
-        # We don't make this a strict assertion because some test environments
-        # might not show a speedup with such a small test set
         assert len(result_single) == len(result_multi)
         
+        # Each run classified exactly num_workers endpoints at a time
+        assert multi_worker_peak == 4
+        assert single_worker_peak == 1
+        
     @patch('discovery_system.endpoint_classification.extract_endpoint_details')
     def test_queue_based_classification_directly(self, mock_extract):
         """Test the queue-based classification system directly."""
@@ -101,7 +102,7 @@ class TestEndpointClassificationSpeed:
         # Mock extract_endpoint_details to add classification details
         def mock_extract_side_effect(endpoint, *args, **kwargs):
             # Very small delay to simulate API call without actually being slow
-            time.sleep(0.01)
+            time.sleep(0.001)
             return {
                 **endpoint,
                 'manufacturer': 'Test Manufacturer',
@@ -114,15 +115,12 @@ class TestEndpointClassificationSpeed:
         mock_extract.side_effect = mock_extract_side_effect
         
         # Call classify_endpoints directly with 4 workers
-        start_time = time.time()
         result = classify_endpoints(
             endpoints=endpoints,
             num_workers=4,
             username='admin',
             password='TANDBERG'
         )
-        end_time = time.time()
-        classification_time = end_time - start_time
         
         # Verify results
         assert len(result) == 5
@@ -130,5 +128,3 @@ class TestEndpointClassificationSpeed:
             assert 'manufacturer' in endpoint
             assert 'model' in endpoint
             assert 'status' in endpoint
-        
-        print(f"\nClassification time for 5 endpoints with 4 workers: {classification_time:.4f}s")
@@ -1,12 +1,9 @@
 import pytest
-import sys
-from pathlib import Path
 from unittest.mock import patch, MagicMock
 
-# Add the parent directory to the path so we can import discovery_system
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from tests._fixtures import FakeResp
 
-from discovery_system.discover import find_endpoints, get_endpoint_details
+from discovery_system.discover import find_endpoints, iter_endpoints, get_endpoint_details
 from discovery_system.network_utils import scan_network
 from discovery_system.endpoint_classification import classify_endpoints
 
@@ -167,9 +164,7 @@ class TestNetworkUtils:
         mock_socket_instance.connect_ex.return_value = 0  # Port is open
         
         # Set up mock HTTP response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.text = '<title>Cisco Webex Room Kit</title>'
+        mock_response = FakeResp(200, '<title>Cisco Webex Room Kit</title>')
         mock_requests.return_value = mock_response
         
         # Call scan_network with a very narrow IP range to avoid long test times
@@ -203,7 +198,8 @@ class TestNetworkUtils:
             None, 
             force_endpoints=None, 
             username='admin', 
-            password='TANDBERG'
+            password='TANDBERG',
+            connect_timeout=0.2
         )
         
         # Verify that classify_endpoints was called with credentials
@@ -213,3 +209,64 @@ class TestNetworkUtils:
             username='admin', 
             password='TANDBERG'
         )
+    
+    @patch('discovery_system.discover.scan_network')
+    def test_find_endpoints_rescans_by_default(self, mock_scan, capsys):
+        """Test that scan results are not reused unless the cache is turned on"""
+        mock_scan.return_value = [
+            {'ip': '192.168.1.10', 'type': 'video_endpoint', 'name': 'Meeting Room 1'}
+        ]
+        
+        find_endpoints('192.168.1.0/24', include_details=False)
+        find_endpoints('192.168.1.0/24', include_details=False)
+        
+        assert mock_scan.call_count == 2
+        assert 'cached' not in capsys.readouterr().out
+    
+    @patch('discovery_system.discover.SCAN_CACHE_TTL', 60)
+    @patch('discovery_system.discover.scan_network')
+    def test_find_endpoints_reuses_recent_scan(self, mock_scan, capsys):
+        """Test that repeated scans of the same range and credentials hit the cache when it is on"""
+        mock_scan.return_value = [
+            {'ip': '192.168.1.10', 'type': 'video_endpoint', 'name': 'Meeting Room 1'}
+        ]
+        
+        first = find_endpoints('192.168.1.0/24', include_details=False)
+        first[0]['name'] = 'Changed by caller'
+        second = find_endpoints('192.168.1.0/24', include_details=False)
+        
+        # Only one real scan, and callers cannot corrupt the cached result
+        assert mock_scan.call_count == 1
+        assert second[0]['name'] == 'Meeting Room 1'
+        
+        # The cache hit is reported on stderr, away from the JSON output
+        captured = capsys.readouterr()
+        assert 'Using cached scan results' in captured.err
+        assert 'Using cached scan results' not in captured.out
+        
+        # Different credentials or ranges are scanned separately
+        find_endpoints('192.168.1.0/24', include_details=False, password='other')
+        find_endpoints('192.168.2.0/24', include_details=False)
+        assert mock_scan.call_count == 3
+    
+    @patch('discovery_system.discover.iter_classify_endpoints')
+    @patch('discovery_system.discover.iter_scan_network')
+    def test_iter_endpoints_streams_video_endpoints(self, mock_scan, mock_classify):
+        """Test that iter_endpoints passes only video endpoints from the running scan on"""
+        mock_scan.return_value = iter([
+            {'ip': '192.168.1.10', 'type': 'video_endpoint', 'name': 'Meeting Room 1'},
+            {'ip': '192.168.1.11', 'type': 'unknown', 'name': 'Printer'}
+        ])
+        mock_classify.side_effect = lambda endpoints, **kwargs: (dict(endpoint, manufacturer='Cisco') for endpoint in endpoints)
+        
+        result = list(iter_endpoints('192.168.1.0/24', connect_timeout=1.0))
+        
+        assert result == [{'ip': '192.168.1.10', 'type': 'video_endpoint', 'name': 'Meeting Room 1', 'manufacturer': 'Cisco'}]
+        assert mock_scan.call_args[1]['connect_timeout'] == 1.0
+        
+        # Without details the endpoints are simplified instead of classified
+        mock_scan.return_value = iter([{'ip': '192.168.1.10', 'type': 'video_endpoint', 'name': 'Meeting Room 1', 'open_ports': [5060]}])
+        assert list(iter_endpoints('192.168.1.0/24', include_details=False)) == [
+            {'ip': '192.168.1.10', 'name': 'Meeting Room 1', 'type': 'video_endpoint'}
+        ]
+        assert mock_classify.call_count == 1
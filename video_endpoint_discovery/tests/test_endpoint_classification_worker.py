@@ -2,17 +2,13 @@
 Test the endpoint classification worker system that uses a queue
 """
 
-import sys
-import os
 import pytest
 import threading
 import queue
+import time
 from unittest.mock import patch, MagicMock
 
-# Add the parent directory to the path so we can import discovery_system modules
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
-from discovery_system.endpoint_classification import EndpointClassificationWorker, classify_endpoints
+from discovery_system.endpoint_classification import EndpointClassificationWorker, classify_endpoints, iter_classify_endpoints
 
 
 class TestEndpointClassificationWorker:
@@ -70,14 +66,15 @@ class TestEndpointClassificationWorker:
                 }
             ]
             
-            # Create a worker and start it
-            worker = EndpointClassificationWorker(
-                endpoint_queue=self.endpoint_queue,
-                results=self.result_list,
-                lock=self.lock,
-                username='admin',
-                password='TANDBERG'
-            )
+            # Create a worker and start it; the class is kept only for existing callers
+            with pytest.warns(DeprecationWarning):
+                worker = EndpointClassificationWorker(
+                    endpoint_queue=self.endpoint_queue,
+                    results=self.result_list,
+                    lock=self.lock,
+                    username='admin',
+                    password='TANDBERG'
+                )
             
             # Start the worker in a thread
             worker_thread = threading.Thread(target=worker.run)
@@ -145,3 +142,125 @@ class TestEndpointClassificationWorker:
                 assert endpoint['classified'] == True
                 assert 'manufacturer' in endpoint
                 assert 'model' in endpoint
+    
+    def test_classify_endpoints_empty_list_uses_no_threads(self):
+        """Test that an empty list or no workers never touches the shared pool."""
+        from discovery_system.endpoint_classification import _get_executor
+        
+        with patch('discovery_system.endpoint_classification._get_executor',
+                   wraps=_get_executor) as mock_get_executor:
+            assert classify_endpoints(endpoints=[], num_workers=8) == []
+            assert classify_endpoints(endpoints=[{'ip': '192.168.1.1'}], num_workers=0) == []
+            mock_get_executor.assert_not_called()
+    
+    def test_classify_endpoints_limits_endpoints_in_flight(self):
+        """Test that each call classifies at most num_workers endpoints at once."""
+        endpoints = [{'ip': f'192.168.1.{n}', 'type': 'video_endpoint'} for n in range(1, 13)]
+        lock = threading.Lock()
+        running = [0]
+        peaks = []
+        
+        def mock_extract_side_effect(endpoint, *args, **kwargs):
+            with lock:
+                running[0] += 1
+                peaks[-1] = max(peaks[-1], running[0])
+            time.sleep(0.01)
+            with lock:
+                running[0] -= 1
+            return dict(endpoint)
+        
+        with patch('discovery_system.endpoint_classification.extract_endpoint_details') as mock_extract:
+            mock_extract.side_effect = mock_extract_side_effect
+            
+            # A wide call first, so the shared pool already has idle threads
+            for num_workers in (8, 1, 3):
+                peaks.append(0)
+                assert len(classify_endpoints(endpoints=endpoints, num_workers=num_workers)) == 12
+        
+        assert peaks == [8, 1, 3]
+    
+    def test_classify_endpoints_keeps_order_and_failed_endpoints(self):
+        """Test that results follow the input order and failed endpoints are kept."""
+        endpoints = [{'ip': f'192.168.1.{n}', 'type': 'video_endpoint'} for n in range(1, 7)]
+        
+        with patch('discovery_system.endpoint_classification.extract_endpoint_details') as mock_extract:
+            def mock_extract_side_effect(endpoint, *args, **kwargs):
+                if endpoint['ip'] == '192.168.1.3':
+                    raise ConnectionError('unreachable')
+                return dict(endpoint, manufacturer='Cisco')
+            
+            mock_extract.side_effect = mock_extract_side_effect
+            
+            classified_endpoints = classify_endpoints(endpoints=endpoints, num_workers=3)
+        
+        assert [endpoint['ip'] for endpoint in classified_endpoints] == [endpoint['ip'] for endpoint in endpoints]
+        assert classified_endpoints[2] is endpoints[2]
+        assert all(endpoint['manufacturer'] == 'Cisco' for n, endpoint in enumerate(classified_endpoints) if n != 2)
+    
+    def test_classify_endpoints_reuses_worker_threads(self):
+        """Test that repeated calls share one fixed-size executor instead of starting new threads."""
+        from discovery_system.endpoint_classification import _get_executor
+        
+        executor = _get_executor()
+        assert _get_executor() is executor
+        
+        with patch('discovery_system.endpoint_classification.extract_endpoint_details') as mock_extract:
+            mock_extract.side_effect = lambda endpoint, *args, **kwargs: dict(endpoint)
+            classify_endpoints(endpoints=[{'ip': '192.168.1.1'}, {'ip': '192.168.1.2'}], num_workers=2)
+        
+        assert _get_executor() is executor
+    
+    def test_iter_classify_endpoints_yields_before_input_ends(self):
+        """Test that classified endpoints are handed out while the scan is still running."""
+        scan_finished = threading.Event()
+        
+        def slow_scan():
+            yield {'ip': '192.168.1.1', 'type': 'video_endpoint'}
+            # Stands in for the rest of a scan that only ends once the
+            # first endpoint has been received
+            scan_finished.wait(2)
+            yield {'ip': '192.168.1.2', 'type': 'video_endpoint'}
+        
+        with patch('discovery_system.endpoint_classification.extract_endpoint_details') as mock_extract:
+            mock_extract.side_effect = lambda endpoint, *args, **kwargs: dict(endpoint, manufacturer='Cisco')
+            
+            classified = iter_classify_endpoints(slow_scan(), num_workers=2)
+            first = next(classified)
+            assert first['ip'] == '192.168.1.1'
+            assert not scan_finished.is_set()
+            
+            scan_finished.set()
+            rest = list(classified)
+        
+        assert [endpoint['ip'] for endpoint in rest] == ['192.168.1.2']
+        assert rest[0]['manufacturer'] == 'Cisco'
+    
+    def test_iter_classify_endpoints_limits_endpoints_in_flight(self):
+        """Test that streamed classification keeps num_workers endpoints in flight at most."""
+        endpoints = [{'ip': f'192.168.1.{n}', 'type': 'video_endpoint'} for n in range(1, 9)]
+        lock = threading.Lock()
+        running = [0]
+        peak = [0]
+        
+        def mock_extract_side_effect(endpoint, *args, **kwargs):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.01)
+            with lock:
+                running[0] -= 1
+            return dict(endpoint)
+        
+        with patch('discovery_system.endpoint_classification.extract_endpoint_details') as mock_extract:
+            mock_extract.side_effect = mock_extract_side_effect
+            classified = list(iter_classify_endpoints(iter(endpoints), num_workers=2))
+        
+        assert len(classified) == 8
+        assert peak[0] == 2
+    
+    def test_iter_classify_endpoints_empty_input_uses_no_threads(self):
+        """Test that an empty scan or no workers never touches the shared pool."""
+        with patch('discovery_system.endpoint_classification._get_executor') as mock_get_executor:
+            assert list(iter_classify_endpoints(iter([]), num_workers=4)) == []
+            assert list(iter_classify_endpoints([{'ip': '192.168.1.1'}], num_workers=0)) == []
+            mock_get_executor.assert_not_called()
@@ -1,12 +1,9 @@
 import pytest
-import sys
-from pathlib import Path
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 import json
 import re
 
-# Add the parent directory to the path so we can import discovery_system
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from tests._fixtures import FakeResp
 
 from discovery_system.endpoint_details import (
     extract_endpoint_details,
@@ -20,18 +17,16 @@ class TestEndpointDetails:
     """Tests for the endpoint_details module which extracts manufacturer, model, 
     make, URI, and software version from video endpoints."""
     
-    @patch('requests.get')
+    @patch('discovery_system.endpoint_details._http_get')
     def test_extract_endpoint_details_cisco(self, mock_requests):
         """Test extracting details from a Cisco endpoint."""
         # Mock a Cisco endpoint response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.text = """
+        mock_response = FakeResp(200, """
         <title>Cisco Webex Room Kit</title>
         <meta name="description" content="Cisco Webex Room Kit Control Panel">
         <span class="sw-version">RoomOS 10.15.2.2</span>
         <div class="serial-number">FOC12345678</div>
-        """
+        """)
         mock_requests.return_value = mock_response
         
         endpoint = {
@@ -49,17 +44,15 @@ class TestEndpointDetails:
         assert result['uri'] == 'https://192.168.1.100'
         assert 'serial' in result
     
-    @patch('requests.get')
+    @patch('discovery_system.endpoint_details._http_get')
     def test_extract_endpoint_details_polycom(self, mock_requests):
         """Test extracting details from a Polycom endpoint."""
         # Mock a Polycom endpoint response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.text = """
+        mock_response = FakeResp(200, """
         <title>Polycom RealPresence Group 700</title>
         <div class="software-version">Software 6.2.1-12345</div>
         <div class="system-name">Conference Room A</div>
-        """
+        """)
         mock_requests.return_value = mock_response
         
         endpoint = {
@@ -77,17 +70,15 @@ class TestEndpointDetails:
         assert result['uri'] == 'https://192.168.1.101'
         assert 'system_name' in result
     
-    @patch('requests.get')
+    @patch('discovery_system.endpoint_details._http_get')
     def test_extract_endpoint_details_tandberg(self, mock_requests):
         """Test extracting details from a Tandberg endpoint."""
         # Mock a Tandberg endpoint response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.text = """
+        mock_response = FakeResp(200, """
         <title>TANDBERG C40</title>
         <div id="sw-version">TC7.3.6.4c7b8e7</div>
         <div id="product-id">Codec C40</div>
-        """
+        """)
         mock_requests.return_value = mock_response
         
         endpoint = {
@@ -104,16 +95,14 @@ class TestEndpointDetails:
         assert result['sw_version'] == 'TC7.3.6.4c7b8e7'
         assert result['uri'] == 'https://192.168.1.102'  # Using HTTPS since port 443 is in open_ports
     
-    @patch('requests.get')
+    @patch('discovery_system.endpoint_details._http_get')
     def test_extract_endpoint_details_unknown(self, mock_requests):
         """Test extracting details from an unknown endpoint type."""
         # Mock an unknown endpoint response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.text = """
+        mock_response = FakeResp(200, """
         <title>Video Endpoint</title>
         <div>Welcome to the control panel</div>
-        """
+        """)
         mock_requests.return_value = mock_response
         
         endpoint = {
@@ -189,3 +178,202 @@ class TestEndpointDetails:
         # Test with no web ports
         endpoint = {'ip': '192.168.1.102', 'open_ports': [22, 5060]}
         assert get_endpoint_uri(endpoint) == 'http://192.168.1.102'
+    
+    def test_read_html_head_caps_streamed_pages(self):
+        """Test that only the first _HTML_PARSE_CAP bytes of a page are read."""
+        import io
+        import requests
+        from urllib3.response import HTTPResponse
+        from discovery_system.endpoint_details import _read_html_head, _HTML_PARSE_CAP
+        
+        page = b'<html><head><title>Cisco Webex Room Kit</title></head>' + b'x' * (4 * _HTML_PARSE_CAP)
+        body = io.BytesIO(page)
+        
+        response = requests.Response()
+        response.status_code = 200
+        response.encoding = 'utf-8'
+        response.raw = HTTPResponse(body=body, preload_content=False)
+        
+        head = _read_html_head(response)
+        assert len(head) == _HTML_PARSE_CAP
+        assert head.startswith('<html><head><title>Cisco Webex Room Kit</title>')
+        
+        # Test fakes are read through the same raw stream
+        mock_response = FakeResp(200, page.decode())
+        assert _read_html_head(mock_response) == head
+    
+    def test_parse_cisco_details_reuses_parsed_page(self):
+        """Test that a repeated Cisco page is parsed once and callers get their own copy."""
+        from discovery_system.endpoint_details import _parse_cisco_details
+        
+        html_content = """
+        <html>
+        <head><title>Cisco Webex Room Kit</title></head>
+        <body>
+            <span class="sw-version">RoomOS 10.11.2.3</span>
+            <div class="serial-number">FTT234500AB</div>
+        </body>
+        </html>
+        """
+        
+        first = parse_cisco_details(html_content)
+        first['model'] = 'changed by caller'
+        second = parse_cisco_details(html_content)
+        
+        assert second['model'] == 'Webex Room Kit'
+        assert second['serial'] == 'FTT234500AB'
+        assert _parse_cisco_details.cache_info().hits == 1
+        assert _parse_cisco_details.cache_info().misses == 1
+    
+    @patch('discovery_system.endpoint_details._http_get')
+    def test_extract_endpoint_details_queries_again_by_default(self, mock_requests):
+        """Test that details are not reused unless the details cache is turned on."""
+        mock_requests.return_value = FakeResp(200, "<title>Cisco Webex Room Kit</title>")
+        endpoint = {'ip': '192.168.1.101', 'type': 'video_endpoint', 'open_ports': [80, 443]}
+        
+        extract_endpoint_details(endpoint, username='admin', password='TANDBERG')
+        calls_after_first = mock_requests.call_count
+        extract_endpoint_details(endpoint, username='admin', password='TANDBERG')
+        
+        assert mock_requests.call_count == 2 * calls_after_first
+    
+    @patch('discovery_system.endpoint_details.DETAILS_CACHE_TTL', 300)
+    @patch('discovery_system.endpoint_details._http_get')
+    def test_extract_endpoint_details_reuses_recent_result(self, mock_requests, capsys):
+        """Test that an endpoint classified again is answered from the details cache when it is on."""
+        mock_response = FakeResp(200, """
+        <title>Cisco Webex Room Kit</title>
+        <span class="sw-version">RoomOS 10.15.2.2</span>
+        """)
+        mock_requests.return_value = mock_response
+        
+        endpoint = {
+            'ip': '192.168.1.100',
+            'hostname': 'roomkit.local',
+            'type': 'video_endpoint',
+            'open_ports': [80, 443]
+        }
+        
+        first = extract_endpoint_details(endpoint, username='admin', password='TANDBERG')
+        calls_after_first = mock_requests.call_count
+        first['model'] = 'changed by caller'
+        
+        capsys.readouterr()
+        second = extract_endpoint_details(endpoint, username='admin', password='TANDBERG')
+        assert mock_requests.call_count == calls_after_first
+        assert second['model'] == 'Webex Room Kit'
+        
+        # The cache hit is reported on stderr, away from the JSON output
+        captured = capsys.readouterr()
+        assert 'Using cached details' in captured.err
+        assert captured.out == ''
+        
+        # Other credentials are not answered from the cache
+        extract_endpoint_details(endpoint, username='admin', password='other')
+        assert mock_requests.call_count > calls_after_first
+    
+    def test_extract_endpoint_details_skips_page_when_xml_identifies_endpoint(self, mock_http_routes):
+        """Test that a Cisco endpoint identified by status.xml is not asked for its web page."""
+        status_xml = """<?xml version="1.0"?>
+<Status>
+  <SystemUnit>
+    <ProductId>Cisco Webex Room Kit</ProductId>
+    <Software>
+      <DisplayName>RoomOS</DisplayName>
+      <Version>10.15.2.2</Version>
+    </Software>
+  </SystemUnit>
+</Status>"""
+        
+        mock_requests = mock_http_routes({
+            'status.xml': FakeResp(200, status_xml),
+            'config.xml': FakeResp(404, '')
+        }, FakeResp(200, '<title>Cisco Webex Room Kit</title>'))
+        
+        endpoint = {
+            'ip': '192.168.1.100',
+            'hostname': 'roomkit.local',
+            'type': 'video_endpoint',
+            'open_ports': [80, 443]
+        }
+        
+        result = extract_endpoint_details(endpoint, username='admin', password='TANDBERG')
+        
+        assert result['manufacturer'] == 'Cisco'
+        assert result['model'] == 'Webex Room Kit'
+        assert result['sw_version'] == 'RoomOS 10.15.2.2'
+        requested = [call.args[0] for call in mock_requests.call_args_list]
+        assert 'https://192.168.1.100' not in requested
+        
+        # With prefer_xml=False the web page is still requested
+        from discovery_system.endpoint_details import clear_details_cache
+        clear_details_cache()
+        mock_requests.reset_mock()
+        extract_endpoint_details(endpoint, username='admin', password='TANDBERG', prefer_xml=False)
+        requested = [call.args[0] for call in mock_requests.call_args_list]
+        assert 'https://192.168.1.100' in requested
+    
+    def test_extract_endpoint_details_http_only_endpoint_skips_xml_api(self, mock_http_routes):
+        """Test that the XML API is not asked first for an endpoint with only HTTP open."""
+        mock_requests = mock_http_routes({}, FakeResp(200, """
+        <title>Polycom RealPresence Group 500</title>
+        <div class="software-version">6.2.2</div>
+        """))
+        
+        endpoint = {
+            'ip': '192.168.1.103',
+            'hostname': 'polycom.local',
+            'type': 'video_endpoint',
+            'open_ports': [80]
+        }
+        
+        result = extract_endpoint_details(endpoint, username='admin', password='TANDBERG')
+        
+        assert result['manufacturer'] == 'Polycom'
+        requested = [call.args[0] for call in mock_requests.call_args_list]
+        assert not any(url.endswith('.xml') for url in requested)
+    
+    @patch('discovery_system.endpoint_details._reachable_web_ports', return_value=frozenset())
+    @patch('discovery_system.endpoint_details._http_get')
+    def test_extract_endpoint_details_skips_unreachable_endpoint(self, mock_requests, mock_reachable):
+        """Test that an endpoint without known web ports is not requested when it refuses connections."""
+        endpoint = {
+            'ip': '192.168.1.104',
+            'type': 'video_endpoint'
+        }
+        
+        result = extract_endpoint_details(endpoint, username='admin', password='TANDBERG')
+        
+        mock_reachable.assert_called_once_with('192.168.1.104')
+        mock_requests.assert_not_called()
+        assert result['manufacturer'] == 'Unknown'
+        assert result['uri'] == 'https://192.168.1.104'
+        
+        # An endpoint answering on port 80 only is still requested
+        mock_reachable.return_value = frozenset([80])
+        mock_requests.return_value = FakeResp(404, '')
+        extract_endpoint_details(endpoint, username='admin', password='TANDBERG')
+        assert mock_requests.called
+        
+        # Ports reported by the scanner are trusted without a preflight
+        mock_reachable.reset_mock()
+        mock_requests.reset_mock()
+        endpoint['open_ports'] = [443]
+        extract_endpoint_details(endpoint, username='admin', password='TANDBERG')
+        mock_reachable.assert_not_called()
+        assert mock_requests.called
+    
+    def test_reachable_web_ports_tries_both_ports_in_one_batch(self):
+        """Test that the preflight connects to ports 443 and 80 at the same time."""
+        from discovery_system.endpoint_details import _reachable_web_ports
+        
+        batches = []
+        
+        def mock_probe_batch(batch, timeout, open_ports):
+            batches.append(list(batch))
+            open_ports.setdefault('192.168.1.105', set()).add(80)
+        
+        with patch('discovery_system.network_utils._probe_batch', side_effect=mock_probe_batch):
+            assert _reachable_web_ports('192.168.1.105') == frozenset([80])
+        
+        assert batches == [[('192.168.1.105', 443), ('192.168.1.105', 80)]]
@@ -3,28 +3,20 @@
 Test enhanced Cisco endpoint detection
 """
 
-import sys
-import os
-from pathlib import Path
-from unittest.mock import patch, MagicMock
 import xml.etree.ElementTree as ET
 import pytest
 
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from tests._fixtures import FakeResp
 
 class TestEnhancedCiscoDetection:
     """Test the enhanced Cisco endpoint detection logic"""
     
-    @patch('requests.get')
-    def test_enhanced_cisco_detection(self, mock_requests):
+    def test_enhanced_cisco_detection(self, mock_http_routes):
         """Test that we can properly identify Cisco endpoints by checking the XML API"""
         from discovery_system.endpoint_details import extract_endpoint_details
         
         # Create a mock response for the HTML page
-        mock_html_response = MagicMock()
-        mock_html_response.status_code = 200
-        mock_html_response.text = """
+        mock_html_response = FakeResp(200, """
         <!DOCTYPE html>
         <html lang="en">
           <head>
@@ -37,12 +29,10 @@ class TestEnhancedCiscoDetection:
             </div>
           </body>
         </html>
-        """
+        """)
         
         # Create a mock response for status.xml
-        mock_xml_response = MagicMock()
-        mock_xml_response.status_code = 200
-        mock_xml_response.text = """<?xml version="1.0"?>
+        mock_xml_response = FakeResp(200, """<?xml version="1.0"?>
 <Status product="Cisco Codec" version="ce11.28.1.5.04b277ca762" apiVersion="4">
   <SystemUnit>
     <ProductId>Cisco Room Kit</ProductId>
@@ -57,16 +47,10 @@ class TestEnhancedCiscoDetection:
       <MACAddress>AA:BB:CC:DD:EE:FF</MACAddress>
     </Hardware>
   </SystemUnit>
-</Status>"""
+</Status>""")
         
         # Set up the mock to return different responses based on the URL
-        def mock_get_response(url, **kwargs):
-            if "status.xml" in url:
-                return mock_xml_response
-            else:
-                return mock_html_response
-            
-        mock_requests.side_effect = mock_get_response
+        mock_http_routes({'status.xml': mock_xml_response}, mock_html_response)
         
         # Create a test endpoint
         endpoint = {
@@ -2,14 +2,9 @@
 Test for enhanced JSON output with detailed endpoint information
 """
 import pytest
-import sys
 import json
-from pathlib import Path
 from unittest.mock import patch, MagicMock
 
-# Add the parent directory to the path so we can import discovery_system
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 class TestEnhancedOutput:
     """Test the enhanced JSON output format for endpoint details."""
     
@@ -2,19 +2,14 @@
 Test for enhanced XML parsing and more detailed JSON output
 """
 import pytest
-import sys
 import json
-from pathlib import Path
-from unittest.mock import patch, MagicMock
 
-# Add the parent directory to the path so we can import discovery_system
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from tests._fixtures import FakeResp
 
 class TestEnhancedXmlParsing:
     """Test the enhanced XML parsing to extract more detailed information."""
     
-    @patch('requests.get')
-    def test_enhanced_status_xml_parsing(self, mock_requests):
+    def test_enhanced_status_xml_parsing(self, mock_http_routes):
         """Test that we can extract more detailed information from status.xml."""
         from discovery_system.endpoint_details import access_cisco_xml_api
         
@@ -84,22 +79,13 @@ class TestEnhancedXmlParsing:
 </Status>"""
         
         # Mock the requests.get response for status.xml
-        mock_status_response = MagicMock()
-        mock_status_response.status_code = 200
-        mock_status_response.text = status_xml
+        mock_status_response = FakeResp(200, status_xml)
         
         # Mock the requests.get response for config.xml (failure or empty response)
-        mock_config_response = MagicMock()
-        mock_config_response.status_code = 401  # Unauthorized
+        mock_config_response = FakeResp(401, '')  # Unauthorized
         
         # Set up the mock to return our mock responses
-        def mock_get_response(url, **kwargs):
-            if "status.xml" in url:
-                return mock_status_response
-            else:
-                return mock_config_response
-        
-        mock_requests.side_effect = mock_get_response
+        mock_http_routes({'status.xml': mock_status_response}, mock_config_response)
         
         # Define the endpoint data
         endpoint = {
@@ -138,3 +124,47 @@ class TestEnhancedXmlParsing:
         assert isinstance(details['cameras'], list)
         assert len(details['cameras']) > 0
         assert details['cameras'][0]['model'] == 'Cisco Webex Quad Camera'
+    
+    def test_xml_parsing_stops_after_needed_sections(self):
+        """Test that sections after the ones we read are never parsed."""
+        from discovery_system.endpoint_details import _parse_xml_fields
+        
+        # Everything after </SIP> is malformed, so parsing it would raise
+        status_xml = """<?xml version="1.0"?>
+<Status>
+  <SystemUnit><ProductId>Cisco Room Kit</ProductId><ProductType/></SystemUnit>
+  <SIP><URI>room@example.com</URI></SIP>
+  <Audio><Volume>50</Audio>
+</Status>"""
+        
+        fields = _parse_xml_fields(status_xml, frozenset([
+            ('SystemUnit', 'ProductId'),
+            ('SystemUnit', 'ProductType'),
+            ('SystemUnit', 'Name'),
+            ('SIP', 'URI'),
+        ]))
+        
+        assert fields == {
+            ('SystemUnit', 'ProductId'): 'Cisco Room Kit',
+            ('SystemUnit', 'ProductType'): None,
+            ('SIP', 'URI'): 'room@example.com',
+        }
+    
+    def test_lxml_parser_does_not_resolve_external_entities(self, tmp_path):
+        """Test that endpoint XML cannot pull in local files through lxml."""
+        pytest.importorskip('lxml')
+        from discovery_system.endpoint_details import HAVE_LXML, _parse_xml_fields
+        
+        assert HAVE_LXML
+        secret = tmp_path / 'secret.txt'
+        secret.write_text('top secret')
+        
+        status_xml = f"""<?xml version="1.0"?>
+<!DOCTYPE Status [<!ENTITY xxe SYSTEM "{secret.as_uri()}">]>
+<Status>
+  <SystemUnit><ProductId>&xxe;</ProductId></SystemUnit>
+</Status>"""
+        
+        fields = _parse_xml_fields(status_xml, frozenset([('SystemUnit', 'ProductId')]))
+        
+        assert 'top secret' not in (fields[('SystemUnit', 'ProductId')] or '')
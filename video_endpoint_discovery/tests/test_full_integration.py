@@ -1,24 +1,17 @@
 import pytest
-import sys
-from pathlib import Path
-from unittest.mock import patch, MagicMock
 import json
 
-# Add the parent directory to the path so we can import discovery_system
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from tests._fixtures import FakeResp
 
 class TestFullIntegration:
     """Test the full integration of the endpoint discovery system."""
     
-    @patch('discovery_system.endpoint_details.requests.get')
-    def test_cisco_endpoint_full_extraction(self, mock_requests):
+    def test_cisco_endpoint_full_extraction(self, mock_http_routes):
         """Test the full extraction flow for a Cisco endpoint."""
         from discovery_system.endpoint_details import extract_endpoint_details
         
         # Mock successful HTML response
-        mock_html_response = MagicMock()
-        mock_html_response.status_code = 200
-        mock_html_response.text = """
+        mock_html_response = FakeResp(200, """
         <html>
         <head><title>Cisco Webex Room Kit</title></head>
         <body>
@@ -30,12 +23,10 @@ class TestFullIntegration:
             </div>
         </body>
         </html>
-        """
+        """)
         
         # Mock successful status.xml response
-        mock_status_response = MagicMock()
-        mock_status_response.status_code = 200
-        mock_status_response.text = """<?xml version="1.0"?>
+        mock_status_response = FakeResp(200, """<?xml version="1.0"?>
 <Status>
   <SystemUnit>
     <ProductId>Cisco Webex Room Kit</ProductId>
@@ -58,12 +49,10 @@ class TestFullIntegration:
       <Domain>example.com</Domain>
     </DNS>
   </Network>
-</Status>"""
+</Status>""")
         
         # Mock successful config.xml response
-        mock_config_response = MagicMock()
-        mock_config_response.status_code = 200
-        mock_config_response.text = """<?xml version="1.0"?>
+        mock_config_response = FakeResp(200, """<?xml version="1.0"?>
 <Configuration>
   <SystemUnit>
     <Name>Conference Room A</Name>
@@ -75,18 +64,13 @@ class TestFullIntegration:
   <SIP>
     <URI>room.kit@example.com</URI>
   </SIP>
-</Configuration>"""
+</Configuration>""")
         
         # Set up the mock to return our mock responses
-        def mock_get_response(url, **kwargs):
-            if "status.xml" in url:
-                return mock_status_response
-            elif "config.xml" in url:
-                return mock_config_response
-            else:
-                return mock_html_response
-        
-        mock_requests.side_effect = mock_get_response
+        mock_http_routes({
+            'status.xml': mock_status_response,
+            'config.xml': mock_config_response
+        }, mock_html_response)
         
         # Define the endpoint data
         endpoint = {
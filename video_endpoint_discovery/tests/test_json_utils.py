@@ -0,0 +1,61 @@
+import pytest
+import json
+from unittest.mock import patch
+
+from discovery_system import json_utils
+
+
+ENDPOINTS = [
+    {
+        'ip': '192.168.1.10',
+        'type': 'video_endpoint',
+        'open_ports': [80, 443, 5060],
+        'cameras': [{'model': 'Cisco Quad Camera', 'connected': True}],
+        'serial': None
+    }
+]
+
+
+@pytest.mark.parametrize('have_orjson', [True, False])
+def test_dumps_json_matches_stdlib_output(have_orjson):
+    """Test that dumps_json produces the same text as json.dumps(indent=2)"""
+    if have_orjson and not json_utils.HAVE_ORJSON:
+        pytest.skip("orjson not installed")
+
+    with patch.object(json_utils, 'HAVE_ORJSON', have_orjson):
+        output = json_utils.dumps_json(ENDPOINTS)
+
+    assert output == json.dumps(ENDPOINTS, indent=2)
+    assert json.loads(output) == ENDPOINTS
+
+
+@pytest.mark.parametrize('have_orjson', [True, False])
+def test_dumps_json_line_is_single_line(have_orjson):
+    """Test that dumps_json_line produces one compact line that round-trips"""
+    if have_orjson and not json_utils.HAVE_ORJSON:
+        pytest.skip("orjson not installed")
+
+    with patch.object(json_utils, 'HAVE_ORJSON', have_orjson):
+        output = json_utils.dumps_json_line(ENDPOINTS[0])
+
+    assert output == json.dumps(ENDPOINTS[0], separators=(',', ':'))
+    assert '\n' not in output
+
+
+@pytest.mark.parametrize('have_orjson', [True, False])
+def test_dumps_json_escapes_non_ascii_like_stdlib(have_orjson):
+    """Test that non-ASCII room names are written the same way with or without orjson"""
+    if have_orjson and not json_utils.HAVE_ORJSON:
+        pytest.skip("orjson not installed")
+
+    endpoint = {'ip': '192.168.1.11', 'name': 'Møterom Æsir', 'system_name': '会议室 \U0001f4f9'}
+
+    with patch.object(json_utils, 'HAVE_ORJSON', have_orjson):
+        output = json_utils.dumps_json([endpoint])
+        line = json_utils.dumps_json_line(endpoint)
+
+    assert output == json.dumps([endpoint], indent=2)
+    assert line == json.dumps(endpoint, separators=(',', ':'))
+    assert output.isascii() and line.isascii()
+    assert json.loads(line) == endpoint
+
@@ -2,15 +2,11 @@
 Test optimized scan approach that first scans for SIP ports and then only checks those IPs
 """
 
-import sys
-import os
+import socket
 import pytest
 from unittest.mock import patch, MagicMock, call
 
-# Add the parent directory to the path so we can import discovery_system modules
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
-from discovery_system.network_utils import scan_network
+from discovery_system.network_utils import scan_network, iter_scan_network, scan_ip, find_alive_hosts, probe_ports
 
 
 class TestScanNetwork:
@@ -19,7 +15,8 @@ class TestScanNetwork:
     def test_two_phase_scanning(self):
         """Test that the optimized scan works in two phases as expected."""
         # Create a test IP range
-        test_range = "192.168.1.0/28"  # 16 IPs for testing
+        test_range = "192.168.1.0/29"  # Hosts 192.168.1.1 - 192.168.1.6
+        host_count = 6
         
         # Create simulated IP addresses that respond on different ports
         ip_responses = {
@@ -31,18 +28,17 @@ class TestScanNetwork:
             "192.168.1.6": []                    # No open ports, should be skipped
         }
         
-        # This will simulate our first phase scan that only checks SIP ports
-        def mock_scan_ip_first_phase(ip, ports, timeout, **kwargs):
-            if ip in ip_responses:
-                open_ports = [p for p in ports if p in ip_responses[ip]]
+        # This will simulate our first phase probe that only checks SIP ports
+        probed_ips = []
+        
+        def mock_probe_ports_first_phase(ips, ports, timeout, **kwargs):
+            results = {}
+            for ip in ips:
+                probed_ips.append(ip)
+                open_ports = [p for p in ports if p in ip_responses.get(ip, [])]
                 if open_ports:
-                    return {
-                        'ip': ip,
-                        'hostname': f'test-host-{ip}',
-                        'name': f'Device at {ip}',
-                        'open_ports': open_ports
-                    }
-            return None
+                    results[ip] = open_ports
+            return results
         
         # This will simulate our second phase scan that does detailed checks
         def mock_scan_ip_second_phase(ip, ports, timeout, **kwargs):
@@ -60,51 +56,28 @@ class TestScanNetwork:
                 return result
             return None
         
-        # Mock the IP network parsing
-        with patch('ipaddress.ip_network') as mock_ip_network, \
+        # Mock the port probe and the per-IP scan
+        with patch('discovery_system.network_utils.probe_ports') as mock_probe_ports, \
              patch('discovery_system.network_utils.scan_ip') as mock_scan_ip:
             
-            # Setup the IP network mock
-            mock_network = MagicMock()
-            mock_ip_network.return_value = mock_network
-            
-            # Create mock IP addresses
-            mock_ips = []
-            for i in range(1, 7):
-                mock_ip = MagicMock()
-                mock_ip.__str__.return_value = f"192.168.1.{i}"
-                mock_ips.append(mock_ip)
-            
-            # Set up network.hosts() to return our mock IPs
-            mock_network.hosts.return_value = mock_ips
-            
-            # Set up scan_ip to behave differently for first and second phase
-            mock_scan_ip.side_effect = lambda ip, ports, timeout, **kwargs: \
-                mock_scan_ip_first_phase(ip, ports, timeout, **kwargs) \
-                if 5060 in ports and 80 not in ports \
-                else mock_scan_ip_second_phase(ip, ports, timeout, **kwargs)
+            mock_probe_ports.side_effect = mock_probe_ports_first_phase
+            mock_scan_ip.side_effect = mock_scan_ip_second_phase
             
             # Run the scanner
             result = scan_network(test_range)
             
-            # Verify the function was called correctly
-            assert mock_scan_ip.call_count > 0
-            
-            # The first set of calls should only check SIP ports
-            first_phase_calls = [
-                call for call in mock_scan_ip.call_args_list 
-                if call[1]['ports'] == [5060, 5061]
-            ]
-            assert len(first_phase_calls) == len(mock_ips)
+            # The first phase should probe every host for SIP ports only
+            mock_probe_ports.assert_called_once()
+            probe_args, probe_kwargs = mock_probe_ports.call_args
+            assert probe_kwargs['ports'] == [5060, 5061]
+            assert len(probed_ips) == host_count
             
             # The second set of calls should be for IPs that responded in the first phase
             # and should check all video endpoint ports
-            second_phase_calls = [
-                call for call in mock_scan_ip.call_args_list 
-                if call[1]['ports'] != [5060, 5061]
-            ]
+            second_phase_calls = mock_scan_ip.call_args_list
             # Should only check IPs 1, 3, and 5 which responded to SIP ports
             assert len(second_phase_calls) == 3
+            assert all(call[1]['ports'] != [5060, 5061] for call in second_phase_calls)
             
             # Verify we got the right endpoints in the final result
             assert len(result) == 3
@@ -115,3 +88,207 @@ class TestScanNetwork:
             assert "192.168.1.2" not in ip_addresses
             assert "192.168.1.4" not in ip_addresses
             assert "192.168.1.6" not in ip_addresses
+    
+    def test_find_alive_hosts_probes_all_ports_of_a_host_at_once(self):
+        """Test that a dead address costs one connect timeout, not one per port."""
+        batches = []
+        
+        def mock_probe_batch(batch, timeout, open_ports):
+            batches.append(list(batch))
+            if ("10.0.0.2", 443) in batch:
+                open_ports.setdefault("10.0.0.2", set()).add(443)
+        
+        ips = ["10.0.0.1", "10.0.0.2", "10.0.0.3"]
+        ports = [80, 443, 5060, 5061, 1720]
+        with patch('discovery_system.network_utils._probe_batch', side_effect=mock_probe_batch):
+            assert find_alive_hosts(ips, ports=ports, max_concurrency=12) == ["10.0.0.2"]
+        
+        # Two hosts (10 connects) fit in a batch of 12; no host is split up
+        assert [len(batch) for batch in batches] == [10, 5]
+        assert batches[0][:5] == [("10.0.0.1", port) for port in ports]
+    
+    def test_find_alive_hosts_filters_closed_ips(self):
+        """Test that the pre-scan keeps only IPs with an open port, in order."""
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.bind(("127.0.0.1", 0))
+        listener.listen()
+        open_port = listener.getsockname()[1]
+        
+        # A second socket that is bound but not listening refuses connections
+        closed = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        closed.bind(("127.0.0.1", 0))
+        closed_port = closed.getsockname()[1]
+        
+        try:
+            assert find_alive_hosts(["127.0.0.1"], ports=[closed_port, open_port]) == ["127.0.0.1"]
+            assert find_alive_hosts(["127.0.0.1"], ports=[closed_port]) == []
+            assert find_alive_hosts([]) == []
+        finally:
+            listener.close()
+            closed.close()
+    
+    def test_probe_ports_reports_open_ports(self):
+        """Test that the non-blocking probe finds listening ports only."""
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.bind(("127.0.0.1", 0))
+        listener.listen()
+        open_port = listener.getsockname()[1]
+        
+        closed = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        closed.bind(("127.0.0.1", 0))
+        closed_port = closed.getsockname()[1]
+        
+        try:
+            # A batch size of 1 exercises the batching as well
+            result = probe_ports(["127.0.0.1", "127.0.0.2"], ports=[closed_port, open_port], max_sockets=1)
+            assert result == {"127.0.0.1": [open_port]}
+        finally:
+            listener.close()
+            closed.close()
+    
+    def test_probe_ports_reads_ips_one_batch_at_a_time(self):
+        """Test that probe_ports never pulls more addresses than one batch needs."""
+        generated = []
+        
+        def ips():
+            for i in range(1, 11):
+                generated.append(i)
+                yield f"10.0.0.{i}"
+        
+        batch_sizes = []
+        
+        def mock_probe_batch(batch, timeout, open_ports):
+            batch_sizes.append((len(batch), len(generated)))
+            for ip, port in batch:
+                if ip == "10.0.0.7":
+                    open_ports.setdefault(ip, set()).add(port)
+        
+        with patch('discovery_system.network_utils._probe_batch', side_effect=mock_probe_batch):
+            result = probe_ports(ips(), ports=[5060, 5061], max_sockets=4)
+        
+        # Two ports per IP: each batch of 4 targets needs only 2 more IPs
+        assert batch_sizes == [(4, 2), (4, 4), (4, 6), (4, 8), (4, 10)]
+        assert result == {"10.0.0.7": [5060, 5061]}
+    
+    def test_scan_ip_probes_ports_on_reused_selector(self):
+        """Test that scan_ip finds open ports and leaves the thread's selector empty for reuse."""
+        from discovery_system.network_utils import _thread_selector
+        
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.bind(("127.0.0.1", 0))
+        listener.listen()
+        open_port = listener.getsockname()[1]
+        
+        closed = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        closed.bind(("127.0.0.1", 0))
+        closed_port = closed.getsockname()[1]
+        
+        try:
+            result = scan_ip("127.0.0.1", ports=[closed_port, open_port])
+            assert result['open_ports'] == [open_port]
+            assert scan_ip("127.0.0.1", ports=[closed_port]) is None
+            
+            selector = _thread_selector()
+            assert selector is _thread_selector()
+            assert not selector.get_map()
+        finally:
+            listener.close()
+            closed.close()
+    
+    def test_host_ips_reuses_recent_range(self):
+        """Test that a re-scanned range reuses its formatted host addresses."""
+        import ipaddress
+        from discovery_system.network_utils import _host_ips
+        
+        network = ipaddress.ip_network("10.1.0.0/22")
+        hosts = _host_ips(network)
+        
+        assert list(hosts) == [str(ip) for ip in network.hosts()]
+        assert _host_ips(ipaddress.ip_network("10.1.0.0/22")) is hosts
+        
+        # Ranges larger than a /20 are generated lazily and not kept
+        large = _host_ips(ipaddress.ip_network("10.0.0.0/19"))
+        assert not isinstance(large, tuple)
+        assert next(iter(large)) == "10.0.0.1"
+    
+    def test_local_network_range_is_detected_once(self):
+        """Test that the local network range is cached until cache_clear()."""
+        from discovery_system.network_utils import get_local_network_range
+        
+        get_local_network_range.cache_clear()
+        with patch('discovery_system.network_utils.HAVE_NETIFACES', False), \
+             patch('discovery_system.network_utils.socket.socket') as mock_socket:
+            mock_socket.return_value.getsockname.return_value = ('10.2.3.4', 5000)
+            try:
+                assert get_local_network_range() == '10.2.3.0/24'
+                assert get_local_network_range() == '10.2.3.0/24'
+                assert mock_socket.call_count == 1
+                
+                get_local_network_range.cache_clear()
+                get_local_network_range()
+                assert mock_socket.call_count == 2
+            finally:
+                get_local_network_range.cache_clear()
+    
+    def test_scan_network_bounds_detailed_scans_in_flight(self):
+        """Test that phase two never has more than max_workers scans submitted at once."""
+        import threading
+        import concurrent.futures
+        
+        sip_ips = [f"192.168.1.{n}" for n in range(1, 7)]
+        release = threading.Event()
+        submitted = []
+        original_submit = concurrent.futures.ThreadPoolExecutor.submit
+        
+        def counting_submit(executor, fn, *args, **kwargs):
+            submitted.append(args[0])
+            return original_submit(executor, fn, *args, **kwargs)
+        
+        def blocked_scan_ip(ip, **kwargs):
+            release.wait(2)
+            return {'ip': ip, 'type': 'video_endpoint', 'open_ports': [5060]}
+        
+        with patch('discovery_system.network_utils.probe_ports',
+                   return_value={ip: [5060] for ip in sip_ips}), \
+             patch('discovery_system.network_utils.scan_ip', side_effect=blocked_scan_ip), \
+             patch.object(concurrent.futures.ThreadPoolExecutor, 'submit', counting_submit):
+            result = []
+            scanner = threading.Thread(target=lambda: result.extend(scan_network("192.168.1.0/29", max_workers=2)))
+            scanner.start()
+            
+            # While the first scans are blocked, no further IPs are submitted
+            scanner.join(0.2)
+            assert len(submitted) == 2
+            
+            release.set()
+            scanner.join(2)
+        
+        assert sorted(submitted) == sip_ips
+        assert sorted(device['ip'] for device in result) == sip_ips
+    
+    def test_iter_scan_network_yields_devices_as_they_are_found(self):
+        """Test that the generator scan hands out a device before slower scans finish."""
+        import threading
+        
+        sip_ips = ["192.168.1.1", "192.168.1.2", "192.168.1.3"]
+        release = threading.Event()
+        
+        def mock_scan_ip(ip, **kwargs):
+            if ip != "192.168.1.1":
+                release.wait(2)
+            return {'ip': ip, 'type': 'video_endpoint', 'open_ports': [5060]}
+        
+        with patch('discovery_system.network_utils.probe_ports',
+                   return_value={ip: [5060] for ip in sip_ips}), \
+             patch('discovery_system.network_utils.scan_ip', side_effect=mock_scan_ip):
+            devices = iter_scan_network("192.168.1.0/29")
+            
+            # The fast scan is available while the others are still blocked
+            first = next(devices)
+            assert first['ip'] == "192.168.1.1"
+            assert not release.is_set()
+            
+            release.set()
+            rest = list(devices)
+        
+        assert sorted(device['ip'] for device in rest) == sip_ips[1:]
@@ -7,9 +7,6 @@ import os
 import pytest
 from unittest.mock import patch, MagicMock
 
-# Add the parent directory to the path so we can import discovery_system modules
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
 # Import with a different name to avoid name conflicts in the mock patching
 from discovery_system.scanner_cli import main as scanner_main
 
@@ -21,7 +18,7 @@ class TestScannerCLI:
         """Test that the scanner CLI works correctly."""
         # Mock find_endpoints to avoid actual network scanning
         with patch('discovery_system.discover.find_endpoints') as mock_find_endpoints, \
-             patch('discovery_system.scanner_cli.get_local_network_range') as mock_get_range, \
+             patch('discovery_system.network_utils.get_local_network_range') as mock_get_range, \
              patch('sys.argv', ['scanner_cli.py']), \
              patch.dict('os.environ', {}):
             
@@ -66,5 +63,6 @@ class TestScannerCLI:
                 include_details=True,
                 force_endpoints=None,
                 username='admin',
-                password='TANDBERG'
+                password='TANDBERG',
+                connect_timeout=0.2
             )
@@ -0,0 +1,39 @@
+"""
+Test extracting details from the Polycom REST API
+"""
+
+import threading
+from unittest.mock import patch, MagicMock
+
+from discovery_system.vendors.polycom import extract_polycom_api_details
+
+
+class TestPolycomApi:
+    """Tests for the Polycom API probing in the vendors.polycom module."""
+    
+    def test_api_paths_requested_together_and_used_in_order(self):
+        """Test that all API paths are requested at once and the first listed success wins."""
+        endpoint = {'ip': '192.168.1.100', 'type': 'video_endpoint'}
+        
+        responses = {
+            '/rest/system': {'model': 'RealPresence Group 500', 'softwareVersion': '6.2.2'},
+            '/api/rest/system': {'model': 'Other Model', 'softwareVersion': '1.0'}
+        }
+        all_requested = threading.Barrier(4, timeout=2)
+        
+        def mock_get(url, **kwargs):
+            # Every request waits here until all four are in flight
+            all_requested.wait()
+            path = url.split('192.168.1.100', 1)[1]
+            response = MagicMock()
+            response.status_code = 200 if path in responses else 404
+            response.json.return_value = responses.get(path)
+            return response
+        
+        with patch('discovery_system.vendors.polycom.SESSION.get', side_effect=mock_get) as mock_session_get:
+            details = extract_polycom_api_details(endpoint)
+        
+        assert mock_session_get.call_count == 4
+        assert details['model'] == 'RealPresence Group 500'
+        assert details['sw_version'] == '6.2.2'
+        assert details['name'] == 'Polycom RealPresence Group 500 at 192.168.1.100'
@@ -0,0 +1,90 @@
+"""
+Test the credential fallback of the scan_single_endpoint script
+"""
+
+import time
+from unittest.mock import patch
+
+import scan_single_endpoint
+
+
+SCAN_RESULT = {
+    'ip': '192.168.1.60',
+    'hostname': '192.168.1.60',
+    'open_ports': [80, 443, 5060],
+    'type': 'video_endpoint',
+    'name': 'Device at 192.168.1.60'
+}
+
+
+def _unknown(endpoint):
+    return {'ip': endpoint['ip'], 'manufacturer': 'Unknown', 'model': 'Unknown'}
+
+
+@patch('scan_single_endpoint.scan_ip', return_value=SCAN_RESULT)
+def test_user_credentials_win_over_faster_attempts(mock_scan_ip):
+    """Test that a slow success with the user's credentials beats a fast one with a later pair."""
+    def mock_extract(endpoint, username, password):
+        if (username, password) == ('operator', 'secret'):
+            time.sleep(0.2)
+            return dict(_unknown(endpoint), manufacturer='Cisco', model='Webex Room Kit', serial='FTT234500AB')
+        if (username, password) == ('', ''):
+            return dict(_unknown(endpoint), manufacturer='Cisco')
+        return _unknown(endpoint)
+    
+    with patch('scan_single_endpoint.extract_endpoint_details', side_effect=mock_extract):
+        details = scan_single_endpoint.scan_single_endpoint('192.168.1.60', 'operator', 'secret')
+    
+    assert details['model'] == 'Webex Room Kit'
+    assert details['serial'] == 'FTT234500AB'
+
+
+@patch('scan_single_endpoint.scan_ip', return_value=SCAN_RESULT)
+def test_falls_back_to_last_attempt_in_order(mock_scan_ip):
+    """Test that without a useful result the last credentials in the list are reported."""
+    def mock_extract(endpoint, username, password):
+        # The last pair in the list finishes first
+        if (username, password) != ('', ''):
+            time.sleep(0.05)
+        return dict(_unknown(endpoint), tried=f"{username}:{password}")
+    
+    with patch('scan_single_endpoint.extract_endpoint_details', side_effect=mock_extract):
+        details = scan_single_endpoint.scan_single_endpoint('192.168.1.60')
+    
+    assert details['tried'] == ':'
+
+
+@patch('scan_single_endpoint.scan_ip', return_value=SCAN_RESULT)
+def test_every_attempt_failing_returns_none(mock_scan_ip):
+    """Test that attempts that all raise are reported instead of crashing."""
+    with patch('scan_single_endpoint.extract_endpoint_details', side_effect=ConnectionError('unreachable')):
+        assert scan_single_endpoint.scan_single_endpoint('192.168.1.60') is None
+
+
+@patch('scan_single_endpoint.scan_ip', return_value=SCAN_RESULT)
+def test_working_user_credentials_send_no_defaults(mock_scan_ip):
+    """Test that the default credentials are never tried when the user's work."""
+    with patch('scan_single_endpoint.extract_endpoint_details',
+               side_effect=lambda endpoint, username, password: dict(_unknown(endpoint), manufacturer='Cisco')) as mock_extract:
+        details = scan_single_endpoint.scan_single_endpoint('192.168.1.60', 'operator', 'secret')
+    
+    assert details['manufacturer'] == 'Cisco'
+    mock_extract.assert_called_once_with(SCAN_RESULT, 'operator', 'secret')
+
+
+@patch('scan_single_endpoint.scan_ip', return_value=SCAN_RESULT)
+def test_first_useful_fallback_does_not_wait_for_the_rest(mock_scan_ip):
+    """Test that a useful fallback result is returned without waiting for slower later attempts."""
+    def mock_extract(endpoint, username, password):
+        if (username, password) == ('admin', 'TANDBERG'):
+            return dict(_unknown(endpoint), manufacturer='Cisco')
+        if (username, password) == ('', ''):
+            time.sleep(1)
+        return _unknown(endpoint)
+    
+    start = time.monotonic()
+    with patch('scan_single_endpoint.extract_endpoint_details', side_effect=mock_extract):
+        details = scan_single_endpoint.scan_single_endpoint('192.168.1.60', 'operator', 'secret')
+    
+    assert details['manufacturer'] == 'Cisco'
+    assert time.monotonic() - start < 0.5
@@ -0,0 +1,113 @@
+"""
+Test the scan_with_enhanced_output script and its shared response cache
+"""
+
+import pytest
+from unittest.mock import patch
+
+from tests._fixtures import stream_response
+
+import scan_with_enhanced_output
+
+
+STATUS_XML = """<?xml version="1.0"?>
+<Status>
+  <SystemUnit>
+    <ProductId>Cisco Webex Room Kit</ProductId>
+    <Software>
+      <DisplayName>RoomOS</DisplayName>
+      <Version>10.15.2.2</Version>
+    </Software>
+    <Hardware>
+      <SerialNumber>FTT234500AB</SerialNumber>
+    </Hardware>
+  </SystemUnit>
+</Status>"""
+
+
+@pytest.fixture(autouse=True)
+def fresh_response_cache():
+    """Make sure every test fetches its responses from the mocked session."""
+    scan_with_enhanced_output._response_cache.clear()
+    yield
+    scan_with_enhanced_output._response_cache.clear()
+
+
+def test_scan_endpoint_reads_cached_xml_twice():
+    """Test that a streamed response fetched once through the cache can be parsed by every caller."""
+    pages = {
+        'status.xml': (200, STATUS_XML),
+        'config.xml': (404, '')
+    }
+    
+    # Every request gets a fresh one-shot response, as from a real session
+    def mock_get(url, **kwargs):
+        status_code, text = pages.get(url.rpartition('/')[2], (200, '<title>Cisco Webex Room Kit</title>'))
+        return stream_response(status_code, text)
+    
+    with patch.object(scan_with_enhanced_output._SESSION, 'get', side_effect=mock_get) as mock_session_get:
+        details = scan_with_enhanced_output.scan_endpoint('192.168.1.50')
+    
+    assert details['manufacturer'] == 'Cisco'
+    assert details['model'] == 'Webex Room Kit'
+    assert details['sw_version'] == 'RoomOS 10.15.2.2'
+    assert details['serial'] == 'FTT234500AB'
+    
+    # access_cisco_xml_api and extract_endpoint_details shared one request per file
+    requested = [call.args[0] for call in mock_session_get.call_args_list]
+    assert requested.count('https://192.168.1.50/status.xml') == 1
+    assert requested.count('https://192.168.1.50/config.xml') == 1
+
+
+def test_scan_endpoint_leaves_library_fetcher_alone():
+    """Test that other callers of endpoint_details keep their own fetcher while the script runs."""
+    from discovery_system import endpoint_details
+    
+    original_http_get = endpoint_details._http_get
+    fetchers_seen = []
+    
+    def mock_get(url, **kwargs):
+        fetchers_seen.append(endpoint_details._http_get)
+        return stream_response(404, '')
+    
+    with patch.object(scan_with_enhanced_output._SESSION, 'get', side_effect=mock_get):
+        scan_with_enhanced_output.scan_endpoint('192.168.1.51')
+    
+    assert fetchers_seen
+    assert all(fetcher is original_http_get for fetcher in fetchers_seen)
+
+
+def test_cached_get_keys_on_request_options_and_skips_failures():
+    """Test that different request options are fetched separately and failures are retried."""
+    import requests
+    
+    url = 'https://192.168.1.52/status.xml'
+    with patch.object(scan_with_enhanced_output._SESSION, 'get') as mock_session_get:
+        mock_session_get.side_effect = [
+            requests.ConnectionError('unreachable'),
+            stream_response(200, STATUS_XML),
+            stream_response(200, STATUS_XML)
+        ]
+        
+        with pytest.raises(requests.ConnectionError):
+            scan_with_enhanced_output.cached_get(url, timeout=5)
+        
+        # Streaming only changes how the body is read, not the response
+        assert scan_with_enhanced_output.cached_get(url, timeout=5).status_code == 200
+        assert scan_with_enhanced_output.cached_get(url, timeout=5, stream=True).text == STATUS_XML
+        assert mock_session_get.call_count == 2
+        
+        scan_with_enhanced_output.cached_get(url, timeout=1)
+        assert mock_session_get.call_count == 3
+
+
+def test_scan_xml_uses_the_library_parser():
+    """Test that the script parses endpoint XML with the library's parser and options."""
+    from discovery_system import endpoint_details
+    
+    assert scan_with_enhanced_output.ET is endpoint_details.ET
+    assert scan_with_enhanced_output._ITERPARSE_OPTIONS is endpoint_details._ITERPARSE_OPTIONS
+    
+    root_tag, product_id = scan_with_enhanced_output._scan_xml(STATUS_XML.encode(), scan_with_enhanced_output._PRODUCT_ID_PATH)
+    assert root_tag == 'Status'
+    assert product_id.text == 'Cisco Webex Room Kit'
@@ -1,13 +1,9 @@
 import pytest
 import sys
-from pathlib import Path
 from unittest.mock import patch, MagicMock
 import json
 import io
 
-# Add the parent directory to the path so we can import discovery_system
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 
 class TestScannerCLI:
     @patch('sys.stdout', new_callable=io.StringIO)
@@ -70,6 +66,51 @@ class TestScannerCLI:
         else:
             pytest.fail("JSON output not found in CLI output")
     
+    @patch('sys.stdout', new_callable=io.StringIO)
+    @patch('discovery_system.discover.iter_endpoints')
+    @patch('discovery_system.network_utils.get_local_network_range')
+    def test_scanner_cli_json_stream_output(self, mock_get_network_range, mock_iter_endpoints, mock_stdout):
+        """Test that the scanner CLI can output one JSON object per line"""
+        from discovery_system.scanner_cli import main
+        
+        mock_get_network_range.return_value = '192.168.1.0/24'
+        test_endpoints = [
+            {'ip': '192.168.1.10', 'type': 'video_endpoint', 'name': 'Meeting Room 1'},
+            {'ip': '192.168.1.12', 'type': 'video_endpoint', 'name': 'Meeting Room 2'}
+        ]
+        
+        # Each endpoint is written before the next one has been found
+        def mock_iter(**kwargs):
+            for endpoint in test_endpoints:
+                yield endpoint
+                assert json.loads(mock_stdout.getvalue().splitlines()[-1]) == endpoint
+        mock_iter_endpoints.side_effect = mock_iter
+        
+        with patch('sys.argv', ['scanner_cli', '--json-stream']):
+            main()
+        
+        # Every endpoint is a complete JSON document on its own line
+        json_lines = [line for line in mock_stdout.getvalue().splitlines() if line.startswith('{')]
+        assert [json.loads(line) for line in json_lines] == test_endpoints
+        assert mock_iter_endpoints.call_args[1]['ip_range'] == '192.168.1.0/24'
+    
+    @patch('discovery_system.scanner_cli.close_session')
+    @patch('discovery_system.discover.find_endpoints')
+    def test_scanner_cli_closes_session_after_scan(self, mock_find_endpoints, mock_close_session):
+        """Test that the CLI releases pooled endpoint connections once the scan is over, even if it fails"""
+        from discovery_system.scanner_cli import main
+        
+        mock_find_endpoints.return_value = []
+        with patch('sys.argv', ['scanner_cli', '--range', '10.0.0.0/24']):
+            main()
+        mock_close_session.assert_called_once_with()
+        
+        mock_find_endpoints.side_effect = KeyboardInterrupt
+        with patch('sys.argv', ['scanner_cli', '--range', '10.0.0.0/24']):
+            with pytest.raises(KeyboardInterrupt):
+                main()
+        assert mock_close_session.call_count == 2
+    
     @patch('discovery_system.discover.find_endpoints')
     @patch('discovery_system.network_utils.get_local_network_range')
     def test_scanner_cli_auto_detects_network_range(self, mock_get_network_range, mock_find_endpoints):
@@ -1,11 +1,6 @@
 import pytest
-import sys
-from pathlib import Path
 from unittest.mock import patch, MagicMock
 
-# Add the parent directory to the path so we can import discovery_system
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from discovery_system.scanner_cli import parse_arguments, main
 
 class TestScannerCLIDefaults:
@@ -20,6 +15,7 @@ class TestScannerCLIDefaults:
         mock_args.password = None
         mock_args.ip_range = None
         mock_args.json = False
+        mock_args.json_stream = False
         mock_args.simple = False
         mock_args.force_endpoints = None
         mock_parse_args.return_value = mock_args
@@ -31,6 +27,19 @@ class TestScannerCLIDefaults:
         assert args.username == "admin", "Default username should be 'admin'"
         assert args.password == "TANDBERG", "Default password should be 'TANDBERG'"
         
+    def test_parse_arguments_default_connect_timeout(self):
+        """Test that LAN sweeps default to a short connect timeout and that it can be changed."""
+        from discovery_system.network_utils import CONNECT_TIMEOUT
+        
+        with patch('sys.argv', ['scanner_cli']):
+            assert parse_arguments().connect_timeout == 0.2
+        
+        # Library callers get the same default as CLI users
+        assert CONNECT_TIMEOUT == 0.2
+        
+        with patch('sys.argv', ['scanner_cli', '--connect-timeout', '1.5']):
+            assert parse_arguments().connect_timeout == 1.5
+        
     @patch('discovery_system.discover.find_endpoints')
     def test_main_passes_default_credentials(self, mock_find_endpoints):
         """Test that main passes default values to find_endpoints when no credentials are provided."""
@@ -42,8 +51,10 @@ class TestScannerCLIDefaults:
             mock_args.password = "TANDBERG"
             mock_args.ip_range = "192.168.1.0/24"  # Specify the IP range directly
             mock_args.json = False
+            mock_args.json_stream = False
             mock_args.simple = False
             mock_args.force_endpoints = None
+            mock_args.connect_timeout = 0.2
             mock_parse_args.return_value = mock_args
             
             # Call the function under test
@@ -55,5 +66,6 @@ class TestScannerCLIDefaults:
                 include_details=True,
                 force_endpoints=None,
                 username="admin",
-                password="TANDBERG"
+                password="TANDBERG",
+                connect_timeout=0.2
             )